@@ -0,0 +1,76 @@
+# benchmark_listas.py - Comparación de memoria y velocidad entre SimpleList y UnrolledList
+import sys
+import os
+import time
+import tracemalloc
+
+# Agregar el directorio backend al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_structures.simple_list import SimpleList
+from data_structures.unrolled_list import UnrolledList
+from services.simulator import DroneAction
+
+
+def build_list(list_class, num_elements):
+    """Crear una lista con acciones de dron como en un timeline real"""
+    lista = list_class()
+    for i in range(num_elements):
+        lista.add(DroneAction(f"DR{i % 50:02d}", "wait"))
+    return lista
+
+
+def measure_memory(list_class, num_elements):
+    """Memoria (bytes) usada por la estructura, sin contar las acciones"""
+    actions = [DroneAction(f"DR{i % 50:02d}", "wait") for i in range(num_elements)]
+    
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    lista = list_class()
+    for action in actions:
+        lista.add(action)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    return after - before
+
+
+def measure_time(list_class, num_elements):
+    """Tiempo de agregar, recorrer y acceder por índice"""
+    start = time.perf_counter()
+    lista = build_list(list_class, num_elements)
+    add_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for action in lista:
+        pass
+    iter_time = time.perf_counter() - start
+    
+    # Acceso aleatorio: saltos hacia atrás que invalidan el cursor
+    start = time.perf_counter()
+    step = max(1, num_elements // 200)
+    for i in range(num_elements - 1, -1, -step):
+        lista.get(i)
+    get_time = time.perf_counter() - start
+    
+    return add_time, iter_time, get_time
+
+
+def run_benchmark(num_elements=100000):
+    print(f"BENCHMARK DE LISTAS - {num_elements} acciones")
+    print("=" * 50)
+    
+    for list_class in (SimpleList, UnrolledList):
+        memory = measure_memory(list_class, num_elements)
+        add_time, iter_time, get_time = measure_time(list_class, num_elements)
+        
+        print(f"\n {list_class.__name__}")
+        print(f"   Memoria estructura: {memory / 1024:.1f} KB ({memory / num_elements:.1f} B/elemento)")
+        print(f"   Agregar: {add_time * 1000:.1f} ms")
+        print(f"   Recorrer: {iter_time * 1000:.1f} ms")
+        print(f"   200 accesos por índice: {get_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    run_benchmark(size)
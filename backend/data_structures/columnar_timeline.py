@@ -0,0 +1,149 @@
+from array import array
+
+from .simple_list import SimpleList
+
+# Códigos compactos de acción (índice en ACTION_TYPES)
+ACTION_TYPES = ("move_forward", "move_backward", "irrigate", "wait", "finish")
+MOVE_FORWARD = 0
+MOVE_BACKWARD = 1
+IRRIGATE = 2
+WAIT = 3
+FINISH = 4
+
+
+def action_code(action_type):
+    """Convertir 'move_forward', 'irrigate', etc. a su código numérico"""
+    for code in range(len(ACTION_TYPES)):
+        if ACTION_TYPES[code] == action_type:
+            return code
+    raise ValueError(f"Tipo de acción desconocido: {action_type}")
+
+
+def describe_action(code, row, position):
+    """Texto de la instrucción: 'Adelante (H1P2)', 'Regar', 'Esperar', 'FIN'"""
+    if code == MOVE_FORWARD:
+        return f"Adelante (H{row}P{position})"
+    if code == MOVE_BACKWARD:
+        return f"Atrás (H{row}P{position})"
+    if code == IRRIGATE:
+        return "Regar"
+    if code == WAIT:
+        return "Esperar"
+    return "FIN"
+
+
+class TimelineAction:
+    """Vista de una acción del timeline; la descripción se genera al pedirla"""
+    __slots__ = ("drone_name", "code", "row", "position")
+
+    def __init__(self, drone_name, code, row, position):
+        self.drone_name = drone_name
+        self.code = code
+        self.row = row
+        self.position = position
+
+    @property
+    def action_type(self):
+        return ACTION_TYPES[self.code]
+
+    @property
+    def description(self):
+        return describe_action(self.code, self.row, self.position)
+
+
+class ColumnarTimeline:
+    """
+    Timeline de la simulación guardado por columnas.
+    En lugar de una lista de listas de objetos, cada acción ocupa una fila en
+    arreglos compactos (dron, código de acción, posición destino) y
+    second_offsets[s]..second_offsets[s + 1] delimita las acciones del segundo s.
+    Los segundos deben agregarse en orden creciente, como los produce el simulador.
+    """
+
+    def __init__(self):
+        # Tabla de drones: el timeline guarda solo el índice del dron
+        self.drone_names = SimpleList()
+        self.drone_rows = array('q')  # Con signo: el XML no valida hileras negativas
+        # Columnas de acciones
+        self.second_offsets = array('I', [0, 0])
+        self.drone_indices = array('H')
+        self.action_codes = array('B')
+        self.target_positions = array('I')
+        self.max_seconds = 0
+
+    def register_drone(self, drone_name, row):
+        """Registrar un dron y retornar su índice en el timeline"""
+        self.drone_names.add(drone_name)
+        self.drone_rows.append(row if row is not None else 0)
+        return self.drone_names.get_size() - 1
+
+    def add_second(self, second):
+        """Agregar segundos vacíos hasta 'second'"""
+        if second < self.max_seconds:
+            raise ValueError("El timeline solo admite segundos en orden creciente")
+
+        total = self.second_offsets[-1]
+        while len(self.second_offsets) <= second + 1:
+            self.second_offsets.append(total)
+
+        self.max_seconds = second
+
+    def add_action(self, second, drone_index, code, position=0):
+        """Agregar una acción codificada al segundo indicado"""
+        self.add_second(second)
+        self.drone_indices.append(drone_index)
+        self.action_codes.append(code)
+        self.target_positions.append(position)
+        self.second_offsets[-1] += 1
+
+    def add_action_to_second(self, second, action):
+        """Agregar una acción con drone_name, action_type y position"""
+        drone_index = self.drone_names.find(action.drone_name)
+        if drone_index == -1:
+            drone_index = self.register_drone(action.drone_name, getattr(action, 'row', 0))
+        code = action_code(action.action_type)
+        self.add_action(second, drone_index, code, getattr(action, 'position', 0) or 0)
+
+    def get_actions_at_second(self, second):
+        """Obtener todas las acciones de un segundo específico"""
+        actions = SimpleList()
+        if second < 0 or second > self.max_seconds:
+            return actions  # Lista vacía si no existe
+
+        for i in range(self.second_offsets[second], self.second_offsets[second + 1]):
+            drone_index = self.drone_indices[i]
+            actions.add(TimelineAction(
+                self.drone_names.get(drone_index),
+                self.action_codes[i],
+                self.drone_rows[drone_index],
+                self.target_positions[i]
+            ))
+        return actions
+
+    def get_max_seconds(self):
+        """Obtener el número máximo de segundos simulados"""
+        return self.max_seconds
+
+    def get_action_count(self):
+        return len(self.action_codes)
+
+    def is_empty(self):
+        return len(self.action_codes) == 0
+
+    def to_string(self):
+        """Para debugging - mostrar toda la simulación"""
+        result = "=== TIMELINE DE SIMULACIÓN ===\n"
+
+        for second in range(self.max_seconds + 1):
+            actions = self.get_actions_at_second(second)
+            if not actions.is_empty():
+                result += f"Segundo {second}: ["
+                first = True
+                for action in actions:
+                    if not first:
+                        result += ", "
+                    result += f"{action.drone_name}: {action.description}"
+                    first = False
+                result += "]\n"
+
+        return result
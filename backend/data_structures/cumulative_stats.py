@@ -0,0 +1,117 @@
+from array import array
+
+from .simple_list import SimpleList
+
+class DroneCumulative:
+    """Riegos de un dron en orden: segundo, posición y totales acumulados"""
+    __slots__ = ("seconds", "positions", "water", "fertilizer", "plants")
+
+    def __init__(self):
+        self.seconds = array('I')
+        self.positions = array('I')
+        self.water = array('d')
+        self.fertilizer = array('d')
+        self.plants = array('I')
+
+    def get_size(self):
+        return len(self.seconds)
+
+    def count_until(self, second):
+        """Cantidad de riegos hasta 'second' inclusive (búsqueda binaria)"""
+        low = 0
+        high = len(self.seconds)
+        while low < high:
+            middle = (low + high) // 2
+            if self.seconds[middle] <= second:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+class CumulativeTotals:
+    """Agua, fertilizante y plantas de un dron en un intervalo"""
+    __slots__ = ("drone_name", "water_used", "fertilizer_used", "plants_irrigated", "last_position")
+
+    def __init__(self, drone_name, water_used=0, fertilizer_used=0, plants_irrigated=0, last_position=0):
+        self.drone_name = drone_name
+        self.water_used = water_used
+        self.fertilizer_used = fertilizer_used
+        self.plants_irrigated = plants_irrigated
+        self.last_position = last_position  # Última posición regada (0 si ninguna)
+
+class CumulativeStats:
+    """
+    Sumas prefijas por dron: el riego i guarda el total acumulado hasta él,
+    así que los recursos hasta t (o entre t1 y t2) son una resta de dos
+    prefijos, sin recorrer el timeline.
+    """
+
+    def __init__(self):
+        self.drone_names = SimpleList()
+        self.drones = SimpleList()  # DroneCumulative por dron
+
+    def register_drone(self, drone_name):
+        """Registrar un dron y retornar su índice"""
+        self.drone_names.add(drone_name)
+        self.drones.add(DroneCumulative())
+        return self.drone_names.get_size() - 1
+
+    def record(self, drone_index, second, position, water_used, fertilizer_used, plants_irrigated):
+        """Agregar un riego con los totales del dron ya acumulados"""
+        cumulative = self.drones.get(drone_index)
+        size = cumulative.get_size()
+        if size and second <= cumulative.seconds[size - 1]:
+            raise ValueError("Los riegos de un dron deben registrarse en orden de tiempo")
+
+        cumulative.seconds.append(second)
+        cumulative.positions.append(position)
+        cumulative.water.append(water_used)
+        cumulative.fertilizer.append(fertilizer_used)
+        cumulative.plants.append(plants_irrigated)
+
+    def stats_until(self, second):
+        """Totales de cada dron hasta el segundo 'second' inclusive"""
+        totals = SimpleList()
+        drone_index = 0
+        for cumulative in self.drones:
+            totals.add(self._prefix(drone_index, cumulative, cumulative.count_until(second)))
+            drone_index += 1
+        return totals
+
+    def stats_between(self, first_second, last_second):
+        """Totales de cada dron en los segundos first_second..last_second"""
+        totals = SimpleList()
+        drone_index = 0
+        for cumulative in self.drones:
+            end = self._prefix(drone_index, cumulative, cumulative.count_until(last_second))
+            start = self._prefix(drone_index, cumulative, cumulative.count_until(first_second - 1))
+            end.water_used -= start.water_used
+            end.fertilizer_used -= start.fertilizer_used
+            end.plants_irrigated -= start.plants_irrigated
+            totals.add(end)
+            drone_index += 1
+        return totals
+
+    def copy_until(self, second):
+        """Nuevas sumas con solo los riegos hasta 'second' (para re-simular)"""
+        stats = CumulativeStats()
+        for drone_index, cumulative in enumerate(self.drones):
+            stats.register_drone(self.drone_names.get(drone_index))
+            count = cumulative.count_until(second)
+            prefix = stats.drones.get(drone_index)
+            prefix.seconds = cumulative.seconds[:count]
+            prefix.positions = cumulative.positions[:count]
+            prefix.water = cumulative.water[:count]
+            prefix.fertilizer = cumulative.fertilizer[:count]
+            prefix.plants = cumulative.plants[:count]
+        return stats
+
+    def _prefix(self, drone_index, cumulative, count):
+        name = self.drone_names.get(drone_index)
+        if count == 0:
+            return CumulativeTotals(name)
+        last = count - 1
+        return CumulativeTotals(
+            name, cumulative.water[last], cumulative.fertilizer[last],
+            cumulative.plants[last], cumulative.positions[last]
+        )
@@ -0,0 +1,157 @@
+class HashEntry:
+    __slots__ = ("key", "value")
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+
+# Marca de casilla borrada: la búsqueda debe seguir sondeando después de ella
+_DELETED = HashEntry(None, None)
+
+class HashMap:
+    """
+    Tabla hash de direccionamiento abierto con sondeo lineal.
+    Los borrados dejan una lápida (_DELETED) para no cortar las cadenas de
+    sondeo; al crecer o al acumular lápidas la tabla se reconstruye.
+    """
+
+    INITIAL_CAPACITY = 8
+    MAX_LOAD_FACTOR = 0.7
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.capacity = self._round_capacity(capacity)
+        self.slots = [None] * self.capacity
+        self.size = 0
+        self.tombstones = 0
+
+    def put(self, key, value):
+        """Agregar o reemplazar el valor de una clave"""
+        if (self.size + self.tombstones + 1) > self.capacity * self.MAX_LOAD_FACTOR:
+            self._resize()
+
+        mask = self.capacity - 1
+        index = hash(key) & mask
+        first_deleted = -1
+
+        while True:
+            entry = self.slots[index]
+            if entry is None:
+                break
+            if entry is _DELETED:
+                if first_deleted == -1:
+                    first_deleted = index
+            elif entry.key == key:
+                entry.value = value
+                return
+            index = (index + 1) & mask
+
+        # Reutilizar la primera lápida encontrada en el camino
+        if first_deleted != -1:
+            index = first_deleted
+            self.tombstones -= 1
+
+        self.slots[index] = HashEntry(key, value)
+        self.size += 1
+
+    def get(self, key, default=None):
+        """Obtener el valor de una clave, o default si no existe"""
+        index = self._find_index(key)
+        if index == -1:
+            return default
+        return self.slots[index].value
+
+    def contains(self, key):
+        return self._find_index(key) != -1
+
+    def remove(self, key):
+        """Eliminar una clave y retornar su valor (None si no existía)"""
+        index = self._find_index(key)
+        if index == -1:
+            return None
+
+        value = self.slots[index].value
+        self.slots[index] = _DELETED
+        self.size -= 1
+        self.tombstones += 1
+        return value
+
+    def clear(self):
+        self.capacity = self.INITIAL_CAPACITY
+        self.slots = [None] * self.capacity
+        self.size = 0
+        self.tombstones = 0
+
+    def is_empty(self):
+        return self.size == 0
+
+    def get_size(self):
+        return self.size
+
+    def __iter__(self):
+        """Recorrer las claves"""
+        for entry in self.slots:
+            if entry is not None and entry is not _DELETED:
+                yield entry.key
+
+    def values(self):
+        for entry in self.slots:
+            if entry is not None and entry is not _DELETED:
+                yield entry.value
+
+    def items(self):
+        for entry in self.slots:
+            if entry is not None and entry is not _DELETED:
+                yield entry.key, entry.value
+
+    def _find_index(self, key):
+        """Índice de la casilla que contiene la clave, o -1"""
+        mask = self.capacity - 1
+        index = hash(key) & mask
+
+        while True:
+            entry = self.slots[index]
+            if entry is None:
+                return -1
+            if entry is not _DELETED and entry.key == key:
+                return index
+            index = (index + 1) & mask
+
+    def _resize(self):
+        """Reconstruir la tabla: duplicar si está llena, o solo limpiar lápidas"""
+        new_capacity = self.capacity
+        if (self.size + 1) > new_capacity * self.MAX_LOAD_FACTOR / 2:
+            new_capacity *= 2
+
+        old_slots = self.slots
+        self.capacity = new_capacity
+        self.slots = [None] * new_capacity
+        self.size = 0
+        self.tombstones = 0
+
+        mask = new_capacity - 1
+        for entry in old_slots:
+            if entry is not None and entry is not _DELETED:
+                index = hash(entry.key) & mask
+                while self.slots[index] is not None:
+                    index = (index + 1) & mask
+                self.slots[index] = entry
+                self.size += 1
+
+    def _round_capacity(self, capacity):
+        """Capacidad potencia de 2 para poder usar '& mask' en lugar de '%'"""
+        result = 1
+        while result < capacity:
+            result *= 2
+        return result
+
+    def to_string(self):
+        """Para debugging"""
+        result = "{"
+        first = True
+        for key, value in self.items():
+            if not first:
+                result += ", "
+            result += f"{key}: {value}"
+            first = False
+        result += "}"
+        return result
@@ -42,8 +42,7 @@ class ListOfLists:
         """Para debugging - mostrar toda la simulación"""
         result = "=== TIMELINE DE SIMULACIÓN ===\n"
         
-        for second in range(self.main_list.get_size()):
-            actions = self.main_list.get(second)
+        for second, actions in enumerate(self.main_list):
             if not actions.is_empty():
                 result += f"Segundo {second}: "
                 result += actions.to_string()
@@ -0,0 +1,97 @@
+from .hash_map import HashMap
+
+class LRUNode:
+    __slots__ = ("key", "value", "previous", "next")
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.previous = None
+        self.next = None
+
+class LRUCache:
+    """
+    Caché de tamaño fijo que descarta el elemento usado hace más tiempo.
+    HashMap clave -> nodo, y una lista doblemente enlazada en orden de uso
+    (head = más reciente, tail = menos reciente).
+    """
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("La capacidad del caché debe ser mayor que 0")
+        self.capacity = capacity
+        self.nodes = HashMap()
+        self.head = None
+        self.tail = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Obtener un valor y marcarlo como el más reciente"""
+        node = self.nodes.get(key)
+        if node is None:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self._move_to_front(node)
+        return node.value
+
+    def put(self, key, value):
+        """Agregar o reemplazar un valor, descartando el menos reciente si está lleno"""
+        node = self.nodes.get(key)
+        if node is not None:
+            node.value = value
+            self._move_to_front(node)
+            return
+
+        if self.nodes.get_size() >= self.capacity:
+            oldest = self.tail
+            self._unlink(oldest)
+            self.nodes.remove(oldest.key)
+            self.evictions += 1
+
+        node = LRUNode(key, value)
+        self._push_front(node)
+        self.nodes.put(key, node)
+
+    def contains(self, key):
+        return self.nodes.contains(key)
+
+    def clear(self):
+        self.nodes = HashMap()
+        self.head = None
+        self.tail = None
+
+    def get_size(self):
+        return self.nodes.get_size()
+
+    def is_empty(self):
+        return self.nodes.is_empty()
+
+    def _move_to_front(self, node):
+        if node is not self.head:
+            self._unlink(node)
+            self._push_front(node)
+
+    def _push_front(self, node):
+        node.previous = None
+        node.next = self.head
+        if self.head is not None:
+            self.head.previous = node
+        self.head = node
+        if self.tail is None:
+            self.tail = node
+
+    def _unlink(self, node):
+        if node.previous is not None:
+            node.previous.next = node.next
+        else:
+            self.head = node.next
+        if node.next is not None:
+            node.next.previous = node.previous
+        else:
+            self.tail = node.previous
+        node.previous = None
+        node.next = None
@@ -0,0 +1,65 @@
+from array import array
+
+class PackedTasks:
+    """
+    Tareas (hilera, posición) de un plan en dos arreglos de enteros sin
+    signo. Es de solo lectura y tiene la misma interfaz de consulta que
+    Queue (peek_at, get_size, recorrido), así que los simuladores la usan
+    igual que a la cola de tuplas.
+    """
+    __slots__ = ("rows", "positions")
+
+    def __init__(self, rows=None, positions=None):
+        self.rows = rows if rows is not None else array('I')
+        self.positions = positions if positions is not None else array('I')
+
+    @classmethod
+    def from_pairs(cls, tasks):
+        """Empacar una secuencia de pares (hilera, posición)"""
+        packed = cls()
+        for row, position in tasks:
+            packed.rows.append(row)
+            packed.positions.append(position)
+        return packed
+
+    def peek(self):
+        """Primera tarea, o None si no hay"""
+        if self.is_empty():
+            return None
+        return self.rows[0], self.positions[0]
+
+    def peek_at(self, index):
+        """Tarea 'index' como (hilera, posición)"""
+        if index < 0 or index >= len(self.rows):
+            raise IndexError("Índice fuera de rango")
+        return self.rows[index], self.positions[index]
+
+    def equals(self, other):
+        """True si ambos planes tienen las mismas tareas en el mismo orden"""
+        return self.rows == other.rows and self.positions == other.positions
+
+    def common_prefix_length(self, other):
+        """
+        Cantidad de tareas iniciales iguales en ambos planes. Búsqueda
+        binaria sobre comparaciones de tramos (en C), sin recorrer tupla
+        por tupla.
+        """
+        low = 0
+        high = min(len(self.rows), len(other.rows))
+        while low < high:
+            middle = (low + high + 1) // 2
+            if (self.rows[low:middle] == other.rows[low:middle]
+                    and self.positions[low:middle] == other.positions[low:middle]):
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def is_empty(self):
+        return len(self.rows) == 0
+
+    def get_size(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return zip(self.rows, self.positions)
@@ -1,38 +1,52 @@
-class QueueNode:
-    def __init__(self, data):
-        self.data = data
-        self.next = None
-
 class Queue:
-    def __init__(self):
-        self.front = None
-        self.rear = None
+    """
+    Cola sobre un búfer circular: front_index apunta al primer elemento y
+    los demás siguen en orden (con vuelta al inicio del arreglo).
+    """
+    INITIAL_CAPACITY = 8
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self.items = [None] * max(capacity, 1)
+        self.front_index = 0
         self.size = 0
     
     def enqueue(self, data):
         """Agregar elemento al final de la cola"""
-        new_node = QueueNode(data)
-        
-        if self.is_empty():
-            self.front = new_node
-            self.rear = new_node
-        else:
-            self.rear.next = new_node
-            self.rear = new_node
+        if self.size == len(self.items):
+            self._grow(self.size + 1)
         
+        rear_index = (self.front_index + self.size) % len(self.items)
+        self.items[rear_index] = data
         self.size += 1
     
+    def enqueue_all(self, elements):
+        """Agregar varios elementos al final, reservando espacio una sola vez"""
+        if not hasattr(elements, "__len__"):
+            for data in elements:
+                self.enqueue(data)
+            return
+        
+        if self.size + len(elements) > len(self.items):
+            self._grow(self.size + len(elements))
+        
+        # Copiar directo al búfer (sin pasar por enqueue elemento a elemento)
+        capacity = len(self.items)
+        rear_index = (self.front_index + self.size) % capacity
+        for data in elements:
+            self.items[rear_index] = data
+            rear_index += 1
+            if rear_index == capacity:
+                rear_index = 0
+        self.size += len(elements)
+    
     def dequeue(self):
         """Eliminar y retornar elemento del frente"""
         if self.is_empty():
             raise Exception("Cola vacía")
         
-        data = self.front.data
-        self.front = self.front.next
-        
-        if self.front is None:  # Cola quedó vacía
-            self.rear = None
-            
+        data = self.items[self.front_index]
+        self.items[self.front_index] = None
+        self.front_index = (self.front_index + 1) % len(self.items)
         self.size -= 1
         return data
     
@@ -40,25 +54,49 @@ class Queue:
         """Ver elemento del frente sin eliminarlo"""
         if self.is_empty():
             return None
-        return self.front.data
+        return self.items[self.front_index]
+    
+    def peek_at(self, index):
+        """Ver el elemento en la posición 'index' contando desde el frente"""
+        if index < 0 or index >= self.size:
+            raise IndexError("Índice fuera de rango")
+        return self.items[(self.front_index + index) % len(self.items)]
     
     def is_empty(self):
-        return self.front is None
+        return self.size == 0
     
     def get_size(self):
         return self.size
     
+    def __iter__(self):
+        """Recorrer del frente al final sin consumir la cola"""
+        for i in range(self.size):
+            yield self.items[(self.front_index + i) % len(self.items)]
+    
+    def _grow(self, min_capacity):
+        """Copiar los elementos a un arreglo más grande, empezando en 0"""
+        new_capacity = len(self.items) * 2
+        while new_capacity < min_capacity:
+            new_capacity *= 2
+        
+        new_items = [None] * new_capacity
+        for i in range(self.size):
+            new_items[i] = self.items[(self.front_index + i) % len(self.items)]
+        
+        self.items = new_items
+        self.front_index = 0
+    
     def to_string(self):
         """Para debugging"""
         if self.is_empty():
             return "Cola vacía"
         
         result = "Front -> "
-        current = self.front
-        while current:
-            result += str(current.data)
-            if current.next:
+        first = True
+        for data in self:
+            if not first:
                 result += " -> "
-            current = current.next
+            result += str(data)
+            first = False
         result += " <- Rear"
-        return result
\ No newline at end of file
+        return result
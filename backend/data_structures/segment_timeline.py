@@ -0,0 +1,215 @@
+from array import array
+
+from .simple_list import SimpleList
+from .columnar_timeline import (
+    ColumnarTimeline, TimelineAction, ACTION_TYPES,
+    MOVE_FORWARD, MOVE_BACKWARD, WAIT
+)
+
+
+class DroneSegments:
+    """Tramos de un dron ordenados por segundo de inicio (columnas)"""
+    __slots__ = ("start_seconds", "durations", "action_codes", "start_positions")
+
+    def __init__(self):
+        self.start_seconds = array('I')
+        self.durations = array('I')
+        self.action_codes = array('B')
+        self.start_positions = array('I')  # Posición del dron antes del tramo
+
+    def get_size(self):
+        return len(self.start_seconds)
+
+    def find(self, second):
+        """Índice del tramo que cubre 'second', o -1 (búsqueda binaria)"""
+        low = 0
+        high = len(self.start_seconds) - 1
+        while low <= high:
+            middle = (low + high) // 2
+            start = self.start_seconds[middle]
+            if second < start:
+                high = middle - 1
+            elif second >= start + self.durations[middle]:
+                low = middle + 1
+            else:
+                return middle
+        return -1
+
+
+class TimelineSegment:
+    """Tramo de acciones iguales: 'DR01 avanza durante 37 s'"""
+    __slots__ = ("drone_name", "code", "start_second", "duration", "start_position")
+
+    def __init__(self, drone_name, code, start_second, duration, start_position):
+        self.drone_name = drone_name
+        self.code = code
+        self.start_second = start_second
+        self.duration = duration
+        self.start_position = start_position
+
+    @property
+    def action_type(self):
+        return ACTION_TYPES[self.code]
+
+    @property
+    def end_second(self):
+        return self.start_second + self.duration - 1
+
+
+class SegmentTimeline:
+    """
+    Timeline por tramos (run-length): cada dron guarda solo sus tramos de
+    movimiento y riego; fuera de ellos está esperando. Las acciones de un
+    segundo se calculan al pedirlas, y expand() genera el timeline completo.
+    """
+
+    def __init__(self):
+        self.drone_names = SimpleList()
+        self.drone_rows = array('q')  # Con signo: el XML no valida hileras negativas
+        self.drone_segments = SimpleList()  # DroneSegments por dron
+        self.max_seconds = 0
+
+    def register_drone(self, drone_name, row):
+        """Registrar un dron y retornar su índice en el timeline"""
+        self.drone_names.add(drone_name)
+        self.drone_rows.append(row if row is not None else 0)
+        self.drone_segments.add(DroneSegments())
+        return self.drone_names.get_size() - 1
+
+    def add_segment(self, drone_index, start_second, duration, code, start_position):
+        """Agregar un tramo de 'duration' segundos con la misma acción"""
+        if duration <= 0:
+            return
+
+        segments = self.drone_segments.get(drone_index)
+        size = segments.get_size()
+        if size and start_second < segments.start_seconds[size - 1] + segments.durations[size - 1]:
+            raise ValueError("Los tramos de un dron deben agregarse en orden y sin solaparse")
+
+        segments.start_seconds.append(start_second)
+        segments.durations.append(duration)
+        segments.action_codes.append(code)
+        segments.start_positions.append(start_position)
+
+        end_second = start_second + duration - 1
+        if end_second > self.max_seconds:
+            self.max_seconds = end_second
+
+    def get_segment_counts(self):
+        """Cantidad de tramos de cada dron (para marcar un punto de control)"""
+        counts = array('I')
+        for segments in self.drone_segments:
+            counts.append(segments.get_size())
+        return counts
+
+    def copy_prefix(self, segment_counts):
+        """Nuevo timeline con solo los primeros segment_counts[i] tramos de cada dron"""
+        timeline = SegmentTimeline()
+        drone_index = 0
+        for segments in self.drone_segments:
+            timeline.register_drone(self.drone_names.get(drone_index), self.drone_rows[drone_index])
+            count = segment_counts[drone_index]
+            if count:
+                prefix = timeline.drone_segments.get(drone_index)
+                prefix.start_seconds = segments.start_seconds[:count]
+                prefix.durations = segments.durations[:count]
+                prefix.action_codes = segments.action_codes[:count]
+                prefix.start_positions = segments.start_positions[:count]
+                end_second = prefix.start_seconds[count - 1] + prefix.durations[count - 1] - 1
+                if end_second > timeline.max_seconds:
+                    timeline.max_seconds = end_second
+            drone_index += 1
+        return timeline
+
+    def get_actions_at_second(self, second):
+        """Obtener todas las acciones de un segundo específico"""
+        actions = SimpleList()
+        if second < 1 or second > self.max_seconds:
+            return actions  # Lista vacía si no existe
+
+        drone_index = 0
+        for segments in self.drone_segments:
+            code, position = self._action_of(segments, second)
+            actions.add(TimelineAction(
+                self.drone_names.get(drone_index),
+                code,
+                self.drone_rows[drone_index],
+                position
+            ))
+            drone_index += 1
+        return actions
+
+    def get_max_seconds(self):
+        """Obtener el número máximo de segundos simulados"""
+        return self.max_seconds
+
+    def is_empty(self):
+        return self.max_seconds == 0
+
+    def iter_segments(self):
+        """Recorrer los tramos en orden de inicio (empates por índice de dron)"""
+        cursors = [0] * self.drone_names.get_size()
+        all_segments = list(self.drone_segments)
+        names = list(self.drone_names)
+
+        while True:
+            best = -1
+            best_start = 0
+            for drone_index in range(len(all_segments)):
+                segments = all_segments[drone_index]
+                cursor = cursors[drone_index]
+                if cursor < segments.get_size():
+                    start = segments.start_seconds[cursor]
+                    if best == -1 or start < best_start:
+                        best = drone_index
+                        best_start = start
+            if best == -1:
+                return
+
+            segments = all_segments[best]
+            cursor = cursors[best]
+            cursors[best] += 1
+            yield TimelineSegment(
+                names[best],
+                segments.action_codes[cursor],
+                segments.start_seconds[cursor],
+                segments.durations[cursor],
+                segments.start_positions[cursor]
+            )
+
+    def expand(self):
+        """Generar el ColumnarTimeline completo, segundo por segundo"""
+        timeline = ColumnarTimeline()
+        for drone_index, name in enumerate(self.drone_names):
+            timeline.register_drone(name, self.drone_rows[drone_index])
+
+        for second in range(1, self.max_seconds + 1):
+            drone_index = 0
+            for segments in self.drone_segments:
+                code, position = self._action_of(segments, second)
+                timeline.add_action(second, drone_index, code, position)
+                drone_index += 1
+        return timeline
+
+    def _action_of(self, segments, second):
+        """(código, posición destino) de un dron en un segundo"""
+        index = segments.find(second)
+        if index == -1:
+            return WAIT, 0
+
+        code = segments.action_codes[index]
+        offset = second - segments.start_seconds[index] + 1
+        position = segments.start_positions[index]
+        if code == MOVE_FORWARD:
+            position += offset
+        elif code == MOVE_BACKWARD:
+            position -= offset
+        return code, position
+
+    def to_string(self):
+        """Para debugging - mostrar los tramos"""
+        result = "=== TIMELINE POR TRAMOS ===\n"
+        for segment in self.iter_segments():
+            result += (f"{segment.drone_name}: {segment.action_type} "
+                       f"segundos {segment.start_second}-{segment.end_second}\n")
+        return result
@@ -1,4 +1,6 @@
 class Node:
+    __slots__ = ("data", "next")
+
     def __init__(self, data):
         self.data = data
         self.next = None
@@ -6,7 +8,11 @@ class Node:
 class SimpleList:
     def __init__(self):
         self.head = None
+        self.tail = None
         self.size = 0
+        # Cursor del último acceso por índice (acceso secuencial amortizado O(1))
+        self._cursor_node = None
+        self._cursor_index = -1
     
     def add(self, data):
         """Agregar elemento al final"""
@@ -14,10 +20,8 @@ class SimpleList:
         if not self.head:
             self.head = new_node
         else:
-            current = self.head
-            while current.next:
-                current = current.next
-            current.next = new_node
+            self.tail.next = new_node
+        self.tail = new_node
         self.size += 1
     
     def get(self, index):
@@ -25,11 +29,36 @@ class SimpleList:
         if index < 0 or index >= self.size:
             raise IndexError("Índice fuera de rango")
         
-        current = self.head
-        for i in range(index):
+        if index == self.size - 1:
+            return self.tail.data
+        
+        # Continuar desde el cursor si el índice está adelante
+        if self._cursor_node is not None and self._cursor_index <= index:
+            current = self._cursor_node
+            start = self._cursor_index
+        else:
+            current = self.head
+            start = 0
+        
+        for i in range(index - start):
             current = current.next
+        
+        self._cursor_node = current
+        self._cursor_index = index
         return current.data
     
+    def set(self, index, data):
+        """Reemplazar el elemento de un índice"""
+        if index < 0 or index >= self.size:
+            raise IndexError("Índice fuera de rango")
+        
+        if index == self.size - 1:
+            self.tail.data = data
+            return
+        
+        self.get(index)  # Deja el cursor en el nodo del índice
+        self._cursor_node.data = data
+    
     def remove(self, index):
         """Eliminar elemento por índice"""
         if index < 0 or index >= self.size:
@@ -37,13 +66,18 @@ class SimpleList:
         
         if index == 0:
             self.head = self.head.next
+            if self.head is None:
+                self.tail = None
         else:
             current = self.head
             for i in range(index - 1):
                 current = current.next
             current.next = current.next.next
+            if current.next is None:
+                self.tail = current
         
         self.size -= 1
+        self._reset_cursor()
     
     def find(self, data):
         """Encontrar índice de un elemento"""
@@ -62,6 +96,17 @@ class SimpleList:
     def get_size(self):
         return self.size
     
+    def __iter__(self):
+        """Recorrer los elementos en orden, nodo por nodo"""
+        current = self.head
+        while current:
+            yield current.data
+            current = current.next
+    
+    def _reset_cursor(self):
+        self._cursor_node = None
+        self._cursor_index = -1
+    
     def to_string(self):
         """Para debugging"""
         result = "["
@@ -73,4 +118,4 @@ class SimpleList:
             current = current.next
         result += "]"
         return result
-    
\ No newline at end of file
+    
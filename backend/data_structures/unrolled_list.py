@@ -0,0 +1,149 @@
+class UnrolledNode:
+    """Nodo con un arreglo fijo de elementos en lugar de uno solo"""
+    __slots__ = ("items", "count", "next")
+
+    def __init__(self, capacity):
+        self.items = [None] * capacity
+        self.count = 0
+        self.next = None
+
+class UnrolledList:
+    """
+    Lista enlazada desenrollada con la misma interfaz que SimpleList.
+    Cada nodo guarda hasta NODE_CAPACITY elementos, así que el acceso por
+    índice recorre n/B nodos y se crean muchos menos objetos por elemento.
+    """
+    __slots__ = ("head", "tail", "size", "node_capacity", "_cursor_node", "_cursor_start")
+
+    NODE_CAPACITY = 64
+
+    def __init__(self, node_capacity=NODE_CAPACITY):
+        if node_capacity < 1:
+            raise ValueError("La capacidad del nodo debe ser mayor que 0")
+        self.head = None
+        self.tail = None
+        self.size = 0
+        self.node_capacity = node_capacity
+        # Nodo del último acceso por índice y el índice de su primer elemento
+        self._cursor_node = None
+        self._cursor_start = 0
+
+    def add(self, data):
+        """Agregar elemento al final"""
+        tail = self.tail
+        if tail is None or tail.count == self.node_capacity:
+            new_node = UnrolledNode(self.node_capacity)
+            if tail is None:
+                self.head = new_node
+            else:
+                tail.next = new_node
+            self.tail = tail = new_node
+
+        tail.items[tail.count] = data
+        tail.count += 1
+        self.size += 1
+
+    def get(self, index):
+        """Obtener elemento por índice"""
+        if index < 0 or index >= self.size:
+            raise IndexError("Índice fuera de rango")
+
+        node, start = self._locate(index)
+        return node.items[index - start]
+
+    def set(self, index, data):
+        """Reemplazar el elemento de un índice"""
+        if index < 0 or index >= self.size:
+            raise IndexError("Índice fuera de rango")
+
+        node, start = self._locate(index)
+        node.items[index - start] = data
+
+    def remove(self, index):
+        """Eliminar elemento por índice"""
+        if index < 0 or index >= self.size:
+            raise IndexError("Índice fuera de rango")
+
+        previous = None
+        node = self.head
+        start = 0
+        while index >= start + node.count:
+            start += node.count
+            previous = node
+            node = node.next
+
+        # Desplazar los elementos del nodo una posición a la izquierda
+        items = node.items
+        for i in range(index - start, node.count - 1):
+            items[i] = items[i + 1]
+        node.count -= 1
+        items[node.count] = None
+
+        # Desenlazar el nodo si quedó vacío
+        if node.count == 0:
+            if previous is None:
+                self.head = node.next
+            else:
+                previous.next = node.next
+            if node is self.tail:
+                self.tail = previous
+
+        self.size -= 1
+        self._cursor_node = None
+        self._cursor_start = 0
+
+    def find(self, data):
+        """Encontrar índice de un elemento"""
+        node = self.head
+        start = 0
+        while node:
+            items = node.items
+            for i in range(node.count):
+                if items[i] == data:
+                    return start + i
+            start += node.count
+            node = node.next
+        return -1
+
+    def is_empty(self):
+        return self.size == 0
+
+    def get_size(self):
+        return self.size
+
+    def __iter__(self):
+        """Recorrer los elementos en orden, nodo por nodo"""
+        node = self.head
+        while node:
+            items = node.items
+            for i in range(node.count):
+                yield items[i]
+            node = node.next
+
+    def _locate(self, index):
+        """Buscar el nodo que contiene el índice, partiendo del cursor si es posible"""
+        node = self._cursor_node
+        start = self._cursor_start
+        if node is None or index < start:
+            node = self.head
+            start = 0
+
+        while index >= start + node.count:
+            start += node.count
+            node = node.next
+
+        self._cursor_node = node
+        self._cursor_start = start
+        return node, start
+
+    def to_string(self):
+        """Para debugging"""
+        result = "["
+        first = True
+        for data in self:
+            if not first:
+                result += ", "
+            result += str(data)
+            first = False
+        result += "]"
+        return result
@@ -0,0 +1,91 @@
+from array import array
+
+from data_structures.simple_list import SimpleList
+from data_structures.hash_map import HashMap
+
+class CompiledGreenhouse:
+    """
+    Invernadero en columnas para los simuladores: arreglos planos de drones
+    (nombre, hilera) y matrices densas de agua y fertilizante por
+    (hilera, posición). Se construye una vez y no se modifica; así el ciclo
+    de simulación no recorre SimpleLists ni busca objetos Plant.
+
+    La celda de (hilera, posición) es hilera * width + posición (fila y
+    columna 0 sin usar). Las plantas fuera de las dimensiones declaradas se
+    agregan al final de las matrices.
+    """
+
+    def __init__(self, greenhouse):
+        self.name = greenhouse.name
+        self.num_rows = greenhouse.num_rows
+        self.plants_per_row = greenhouse.plants_per_row
+
+        # Drones, en el orden del invernadero
+        self.drone_names = SimpleList()
+        self.drone_rows = array('q')  # Con signo: el XML no valida hileras negativas
+        for drone, row in zip(greenhouse.drones, greenhouse.drone_rows):
+            self.drone_names.add(drone.name)
+            self.drone_rows.append(row or 0)
+        self.drone_count = len(self.drone_rows)
+
+        # hilera -> índice del primer dron asignado (-1 si no hay)
+        self.drone_index_by_row = array('i', [-1] * (max(self.num_rows, 0) + 1))
+        self._drones_outside_grid = HashMap()
+        for drone_index, row in enumerate(greenhouse.drone_rows):
+            if row is None:
+                continue  # Sin hilera asignada: no riega ninguna
+            if 1 <= row <= self.num_rows:
+                if self.drone_index_by_row[row] == -1:
+                    self.drone_index_by_row[row] = drone_index
+            elif not self._drones_outside_grid.contains(row):
+                self._drones_outside_grid.put(row, drone_index)
+
+        # Recursos por celda; has_plant indica si hay planta en la celda
+        self.width = max(self.plants_per_row, 0) + 1
+        self.grid_size = (max(self.num_rows, 0) + 1) * self.width
+        self.water = array('d', [0.0]) * self.grid_size
+        self.fertilizer = array('d', [0.0]) * self.grid_size
+        self.has_plant = array('B', bytes(self.grid_size))
+        self._cells_outside_grid = HashMap()  # (hilera, posición) -> celda
+        for plant in greenhouse.plants:
+            self._add_plant(plant)
+
+    def _add_plant(self, plant):
+        # Si la posición se repite, se conserva la primera planta (igual que Greenhouse)
+        cell = self._grid_cell(plant.row, plant.position)
+        if cell == -1:
+            key = (plant.row, plant.position)
+            if self._cells_outside_grid.contains(key):
+                return
+            cell = len(self.has_plant)
+            self._cells_outside_grid.put(key, cell)
+            self.water.append(0)
+            self.fertilizer.append(0)
+            self.has_plant.append(0)
+        elif self.has_plant[cell]:
+            return
+
+        self.water[cell] = plant.water_liters
+        self.fertilizer[cell] = plant.fertilizer_grams
+        self.has_plant[cell] = 1
+
+    def get_drone_index_for_row(self, row):
+        """Índice del dron asignado a la hilera, o -1"""
+        if 1 <= row <= self.num_rows:
+            return self.drone_index_by_row[row]
+        return self._drones_outside_grid.get(row, -1)
+
+    def get_plant_cell(self, row, position):
+        """Celda de la planta en (hilera, posición), o -1 si no hay planta"""
+        cell = self._grid_cell(row, position)
+        if cell == -1:
+            return self._cells_outside_grid.get((row, position), -1)
+        return cell if self.has_plant[cell] else -1
+
+    def has_plants_outside_grid(self):
+        return not self._cells_outside_grid.is_empty()
+
+    def _grid_cell(self, row, position):
+        if 1 <= row <= self.num_rows and 1 <= position <= self.plants_per_row:
+            return row * self.width + position
+        return -1
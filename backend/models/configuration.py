@@ -1,28 +1,38 @@
 from data_structures.simple_list import SimpleList
+from data_structures.hash_map import HashMap
 
 class Configuration:
     def __init__(self):
         self.all_drones = SimpleList()  # Todos los drones disponibles
         self.greenhouses = SimpleList()  # Todos los invernaderos
+        self._drones_by_id = HashMap()  # id -> Drone
+        self._greenhouses_by_name = HashMap()  # nombre -> Greenhouse
     
     def add_drone(self, drone):
         self.all_drones.add(drone)
+        # Si el id se repite, se conserva el primero (como la búsqueda lineal)
+        if not self._drones_by_id.contains(drone.id):
+            self._drones_by_id.put(drone.id, drone)
     
     def add_greenhouse(self, greenhouse):
         self.greenhouses.add(greenhouse)
+        if not self._greenhouses_by_name.contains(greenhouse.name):
+            self._greenhouses_by_name.put(greenhouse.name, greenhouse)
     
     def get_drone_by_id(self, drone_id):
         """Buscar dron por ID"""
-        for i in range(self.all_drones.get_size()):
-            drone = self.all_drones.get(i)
-            if drone.id == drone_id:
-                return drone
-        return None
+        return self._drones_by_id.get(drone_id)
     
     def get_greenhouse_by_name(self, name):
         """Buscar invernadero por nombre"""
-        for i in range(self.greenhouses.get_size()):
-            greenhouse = self.greenhouses.get(i)
-            if greenhouse.name == name:
-                return greenhouse
-        return None
\ No newline at end of file
+        return self._greenhouses_by_name.get(name)
+    
+    def has_greenhouse(self, name):
+        return self._greenhouses_by_name.contains(name)
+    
+    def get_greenhouse_summaries(self):
+        """SimpleList de GreenhouseSummary en el orden del archivo"""
+        summaries = SimpleList()
+        for greenhouse in self.greenhouses:
+            summaries.add(greenhouse.get_summary())
+        return summaries
@@ -1,4 +1,16 @@
 from data_structures.simple_list import SimpleList
+from data_structures.hash_map import HashMap
+from models.compiled_greenhouse import CompiledGreenhouse
+
+class GreenhouseSummary:
+    """Nombre, dimensiones y conteos de un invernadero (lo que muestra el listado)"""
+    def __init__(self, name, num_rows, plants_per_row, plant_count, drone_count):
+        self.name = name
+        self.num_rows = num_rows
+        self.plants_per_row = plants_per_row
+        self.plant_count = plant_count
+        self.drone_count = drone_count
+        self.plans = SimpleList()  # (nombre, texto del plan)
 
 class Greenhouse:
     def __init__(self, name, num_rows, plants_per_row):
@@ -7,29 +19,96 @@ class Greenhouse:
         self.plants_per_row = plants_per_row
         self.plants = SimpleList()  # Lista de plantas
         self.drones = SimpleList()  # Lista de drones asignados
+        # Hilera de cada dron en este invernadero (el Drone es compartido entre invernaderos)
+        self.drone_rows = SimpleList()
         self.irrigation_plans = SimpleList()  # Lista de planes de riego
+        self._drones_by_name = HashMap()  # nombre -> Drone
+        self._plans_by_name = HashMap()  # nombre -> IrrigationPlan
+        self._compiled = None  # CompiledGreenhouse, se invalida al agregar plantas o drones
     
     def add_plant(self, plant):
         self.plants.add(plant)
+        self._compiled = None
     
-    def add_drone(self, drone):
+    def add_drone(self, drone, row=None):
+        """Agregar un dron en la hilera 'row' (por defecto drone.assigned_row)"""
         self.drones.add(drone)
+        if row is None:
+            row = drone.assigned_row
+        self.drone_rows.add(row)
+        self._compiled = None
+        if not self._drones_by_name.contains(drone.name):
+            self._drones_by_name.put(drone.name, drone)
     
     def add_irrigation_plan(self, plan):
         self.irrigation_plans.add(plan)
+        if not self._plans_by_name.contains(plan.name):
+            self._plans_by_name.put(plan.name, plan)
+    
+    def replace_irrigation_plan(self, plan):
+        """Reemplazar el plan con el mismo nombre (o agregarlo si no existe)"""
+        current = self._plans_by_name.get(plan.name)
+        if current is None:
+            self.add_irrigation_plan(plan)
+            return
+        
+        index = self.irrigation_plans.find(current)
+        self.irrigation_plans.set(index, plan)
+        self._plans_by_name.put(plan.name, plan)
+    
+    def compile(self):
+        """Construir la representación compilada para los simuladores"""
+        self._compiled = CompiledGreenhouse(self)
+        return self._compiled
+    
+    def get_compiled(self):
+        """Representación compilada (se construye si no existe)"""
+        if self._compiled is None:
+            return self.compile()
+        return self._compiled
+    
+    def get_summary(self):
+        summary = GreenhouseSummary(self.name, self.num_rows, self.plants_per_row,
+                                    self.plants.get_size(), self.drones.get_size())
+        for plan in self.irrigation_plans:
+            summary.plans.add((plan.name, plan.plan_string))
+        return summary
+    
+    def validate_plans(self):
+        """
+        Validar las tareas de cada plan contra las dimensiones y los drones
+        del invernadero; retorna SimpleList de los planes con problemas
+        (cada uno los guarda en plan.issues).
+        """
+        compiled = self.get_compiled()
+        invalid = SimpleList()
+        for plan in self.irrigation_plans:
+            if not plan.validate(compiled).is_empty():
+                invalid.add(plan)
+        return invalid
+    
+    def get_drone_by_name(self, name):
+        """Buscar dron asignado por nombre"""
+        return self._drones_by_name.get(name)
+    
+    def get_plan_by_name(self, name):
+        """Buscar plan de riego por nombre"""
+        return self._plans_by_name.get(name)
     
     def get_plant_at(self, row, position):
-        """Encontrar planta en posición específica"""
-        for i in range(self.plants.get_size()):
-            plant = self.plants.get(i)
+        """Encontrar planta en posición específica (la primera si se repite)"""
+        if row is None or position is None or self.get_compiled().get_plant_cell(row, position) == -1:
+            return None
+        for plant in self.plants:
             if plant.row == row and plant.position == position:
                 return plant
         return None
     
     def get_drone_for_row(self, row):
         """Obtener dron asignado a una hilera"""
-        for i in range(self.drones.get_size()):
-            drone = self.drones.get(i)
-            if drone.assigned_row == row:
-                return drone
-        return None
+        if row is None:
+            return None
+        drone_index = self.get_compiled().get_drone_index_for_row(row)
+        if drone_index == -1:
+            return None
+        return self.drones.get(drone_index)
@@ -1,30 +1,262 @@
+import json
+import re
+from array import array
+
 from data_structures.queue import Queue
+from data_structures.hash_map import HashMap
+from data_structures.simple_list import SimpleList
+from data_structures.packed_tasks import PackedTasks
+
+# Plan ya sin espacios con la forma usual: tareas separadas por comas, números
+# sin ceros a la izquierda y solo saltos de línea o tabuladores junto a las comas
+_NUMBER_PATTERN = r'[1-9][0-9]*+'
+_TASK_PATTERN = rf'[Hh]{_NUMBER_PATTERN}-[Pp]{_NUMBER_PATTERN}'
+_COMPACT_PLAN = re.compile(rf'(?:{_TASK_PATTERN}(?:[\t\n\r]*+,[\t\n\r]*+{_TASK_PATTERN})*+)?')
+# 'H1-P2,H3-P4' -> '1,2,3,4' (se lee como arreglo JSON)
+_TO_NUMBERS = str.maketrans({"H": None, "h": None, "P": None, "p": None, "-": ","})
+
+MAX_REPORTED_ISSUES = 20
+
+def parse_task(token):
+    """Convertir 'H1-P2' a (1, 2); lanza ValueError si la tarea no es válida"""
+    parts = token.split("-")
+    if (len(parts) != 2 or len(parts[0]) < 2 or len(parts[1]) < 2
+            or parts[0][0] not in "Hh" or parts[1][0] not in "Pp"
+            or not parts[0][1:].isdigit() or not parts[1][1:].isdigit()):
+        raise ValueError(f"Tarea inválida en el plan: '{token}'")
+    
+    row = int(parts[0][1:])  # H1 -> 1
+    position = int(parts[1][1:])  # P2 -> 2
+    if row < 1 or position < 1:
+        raise ValueError(f"Tarea inválida en el plan: '{token}'")
+    return row, position
+
+def _is_valid_task(token):
+    """True si la tarea entra en PackedTasks (bien escrita y dentro del rango)"""
+    try:
+        array('I', parse_task(token))
+        return True
+    except (ValueError, OverflowError):
+        return False
+
+def format_task(task):
+    """Convertir (1, 2) a 'H1-P2'"""
+    return f"H{task[0]}-P{task[1]}"
+
+class PlanIssue:
+    """Problema de una tarea: desplazamiento del token en el texto del plan y mensaje"""
+    __slots__ = ("offset", "token", "message", "blocking")
+    
+    def __init__(self, offset, token, message, blocking=False):
+        self.offset = offset
+        self.token = token
+        self.message = message
+        self.blocking = blocking  # True si el plan no se puede simular
+    
+    def to_string(self):
+        return f"{self.message} (desplazamiento {self.offset})"
+
+class PlanError(ValueError):
+    """Plan con tareas inválidas; issues tiene las primeras, con su desplazamiento"""
+    def __init__(self, plan_name, issues, total):
+        self.plan_name = plan_name
+        self.issues = issues
+        self.total = total
+        message = f"Plan '{plan_name}': {issues.get(0).to_string()}"
+        if total > 1:
+            message += f" y {total - 1} errores más"
+        super().__init__(message)
+
+def _compile_plan(plan_string):
+    """
+    'H1-P2, H2-P1, ...' a (PackedTasks de las tareas válidas, SimpleList de
+    PlanIssue, total de errores) en una pasada. La forma usual se valida con
+    una sola expresión regular y los números se convierten en bloque;
+    cualquier otra forma pasa por el recorrido token a token, que acepta lo
+    mismo que parse_task y reporta cada error con su desplazamiento.
+    """
+    compact = plan_string.replace(" ", "")
+    if _COMPACT_PLAN.fullmatch(compact):
+        try:
+            values = array('I', json.loads("[" + compact.translate(_TO_NUMBERS) + "]"))
+            return PackedTasks(values[0::2], values[1::2]), SimpleList(), 0
+        except OverflowError:
+            pass  # Número que no cabe: lo reporta el recorrido token a token
+    return _scan_plan(plan_string)
+
+def _iter_tokens(plan_string):
+    """(desplazamiento, token) de cada tarea no vacía, como la separación de parse_task"""
+    offset = 0
+    for segment in plan_string.split(","):
+        token = segment.replace(" ", "").strip()
+        if token:
+            yield offset + len(segment) - len(segment.lstrip()), token
+        offset += len(segment) + 1
+
+def _scan_plan(plan_string):
+    """Recorrido token a token; junta las tareas válidas y todos los errores"""
+    tasks = PackedTasks()
+    issues = SimpleList()
+    total = 0
+    for offset, token in _iter_tokens(plan_string):
+        try:
+            row, position = parse_task(token)
+            tasks.rows.append(row)
+            tasks.positions.append(position)
+            continue
+        except ValueError as e:
+            message = str(e)
+        except OverflowError:
+            message = f"Tarea fuera de rango en el plan: '{token}'"
+        total += 1
+        if total <= MAX_REPORTED_ISSUES:
+            issues.add(PlanIssue(offset, token, message, True))
+    return tasks, issues, total
 
 class IrrigationPlan:
     def __init__(self, name, plan_string):
         self.name = name
         self.plan_string = plan_string
-        self.irrigation_queue = Queue()
-        self._parse_plan_string(plan_string)
+        # Plan compilado: arreglos de (hilera, posición) ya validados, en orden.
+        # Las tareas mal escritas no entran; quedan en syntax_issues (bloqueantes)
+        self.tasks, self.syntax_issues, self.syntax_error_count = _compile_plan(plan_string)
+        # Problemas del texto y contra el invernadero, de la última llamada a validate()
+        self.issues = self.syntax_issues
+        # Índice de anticipación: hilera -> Queue de índices de sus tareas
+        # (se arma al pedirlo; solo lo usa el modo concurrente del simulador discreto)
+        self._row_tasks = None
+    
+    @classmethod
+    def from_tasks(cls, name, plan_string, tasks):
+        """Plan a partir de tareas ya compiladas (PackedTasks), sin volver a parsear plan_string"""
+        plan = cls.__new__(cls)
+        plan.name = name
+        plan.plan_string = plan_string
+        plan.tasks = tasks
+        plan.syntax_issues = SimpleList()
+        plan.syntax_error_count = 0
+        plan.issues = plan.syntax_issues
+        plan._row_tasks = None
+        return plan
     
-    def _parse_plan_string(self, plan_string):
-        """Parsear 'H1-P2, H2-P1, H2-P2, H3-P3, H1-P4' a cola"""
-        # Limpiar y dividir
-        tasks = plan_string.replace(" ", "").split(",")
+    def validate(self, compiled):
+        """
+        Revisar todas las tareas contra las dimensiones del invernadero
+        compilado y sus drones. Guarda y retorna hasta MAX_REPORTED_ISSUES
+        PlanIssue (primero los del texto del plan); si todo está dentro de la
+        cuadrícula y cada hilera tiene dron, no recorre las tareas una por una.
+        """
+        self.issues = SimpleList()
+        for issue in self.syntax_issues:
+            self.issues.add(issue)
+        rows = self.tasks.rows
+        positions = self.tasks.positions
+        if not rows:
+            return self.issues
+        
+        rows_without_drone = False
+        for row in range(1, compiled.num_rows + 1):
+            if compiled.drone_index_by_row[row] == -1:
+                rows_without_drone = True
+                break
+        if (not rows_without_drone and max(rows) <= compiled.num_rows
+                and max(positions) <= compiled.plants_per_row):
+            return self.issues
         
-        for task in tasks:
-            if task.strip():  # Ignorar elementos vacíos
-                self.irrigation_queue.enqueue(task.strip())
+        total = self.issues.get_size()
+        offsets = None
+        for task_index in range(len(rows)):
+            row = rows[task_index]
+            position = positions[task_index]
+            problems = SimpleList()
+            if compiled.get_drone_index_for_row(row) == -1:
+                problems.add((f"No hay dron asignado a la hilera {row}", True))
+            if row > compiled.num_rows:
+                problems.add((f"Hilera {row} fuera del invernadero ({compiled.num_rows} hileras)", False))
+            if position > compiled.plants_per_row:
+                problems.add((f"Posición {position} fuera de la hilera ({compiled.plants_per_row} plantas por hilera)", False))
+            
+            for message, blocking in problems:
+                total += 1
+                if total > MAX_REPORTED_ISSUES:
+                    continue
+                if offsets is None:
+                    # Desplazamientos solo si hay algo que reportar (de las tareas válidas)
+                    offsets = array('I', (offset for offset, token in _iter_tokens(self.plan_string)
+                                          if _is_valid_task(token)))
+                self.issues.add(PlanIssue(offsets[task_index], format_task((row, position)), message, blocking))
+        return self.issues
+    
+    def check_syntax(self):
+        """Lanza PlanError si el texto del plan tiene tareas inválidas (no se puede simular)"""
+        if self.syntax_error_count:
+            raise PlanError(self.name, self.syntax_issues, self.syntax_error_count)
+    
+    def has_blocking_issues(self):
+        for issue in self.issues:
+            if issue.blocking:
+                return True
+        return False
+    
+    @property
+    def row_tasks(self):
+        """Índice hilera -> Queue de índices de tareas, construido en el primer uso"""
+        if self._row_tasks is None:
+            row_tasks = HashMap()
+            task_index = 0
+            for row in self.tasks.rows:
+                row_queue = row_tasks.get(row)
+                if row_queue is None:
+                    row_queue = Queue()
+                    row_tasks.put(row, row_queue)
+                row_queue.enqueue(task_index)
+                task_index += 1
+            self._row_tasks = row_tasks
+        return self._row_tasks
+    
+    def get_task_count(self):
+        return self.tasks.get_size()
+    
+    def get_task(self, index):
+        """Obtener la tarea 'index' como (hilera, posición)"""
+        return self.tasks.peek_at(index)
+    
+    def start_run(self):
+        """Crear un recorrido del plan; el plan compilado no se modifica"""
+        return PlanRun(self)
+
+class PlanRun:
+    """Avance de una simulación sobre un plan compilado (índice de la tarea actual)"""
+    def __init__(self, plan):
+        self.plan = plan
+        self.current_index = 0
+        self._row_cursors = HashMap()  # hilera -> tareas de esa hilera ya completadas
     
     def get_next_task(self):
-        """Obtener siguiente tarea sin eliminarla"""
-        return self.irrigation_queue.peek()
+        """Obtener siguiente tarea (hilera, posición) sin eliminarla"""
+        if self.is_completed():
+            return None
+        return self.plan.tasks.peek_at(self.current_index)
     
     def complete_current_task(self):
         """Marcar tarea actual como completada"""
-        if not self.irrigation_queue.is_empty():
-            return self.irrigation_queue.dequeue()
-        return None
+        if self.is_completed():
+            return None
+        task = self.plan.tasks.peek_at(self.current_index)
+        self.current_index += 1
+        self._row_cursors.put(task[0], self._row_cursors.get(task[0], 0) + 1)
+        return task
+    
+    def get_next_task_for_row(self, row):
+        """Próxima tarea pendiente (hilera, posición) de una hilera, o None"""
+        row_queue = self.plan.row_tasks.get(row)
+        if row_queue is None:
+            return None
+        
+        cursor = self._row_cursors.get(row, 0)
+        if cursor >= row_queue.get_size():
+            return None
+        return self.plan.tasks.peek_at(row_queue.peek_at(cursor))
     
     def is_completed(self):
-        return self.irrigation_queue.is_empty()
\ No newline at end of file
+        return self.current_index >= self.plan.tasks.get_size()
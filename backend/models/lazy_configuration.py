@@ -0,0 +1,111 @@
+import threading
+
+from data_structures.simple_list import SimpleList
+from data_structures.hash_map import HashMap
+from models.configuration import Configuration
+
+class GreenhouseEntry:
+    """Invernadero todavía sin parsear: bytes que ocupa en el archivo y su resumen"""
+    __slots__ = ("name", "start", "end", "summary", "greenhouse", "error")
+
+    def __init__(self, name, start, end, summary):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.summary = summary  # GreenhouseSummary, o None si hay que cargarlo para contar
+        self.greenhouse = None  # Greenhouse, después de cargarlo
+        self.error = None  # Mensaje si no se pudo cargar
+
+class LazyConfiguration:
+    """
+    Configuración que parsea cada invernadero la primera vez que se pide.
+    Los drones se cargan al inicio; de los invernaderos solo hay un índice
+    con su ubicación en el archivo y lo que muestra el listado. Tiene la
+    misma interfaz de consulta que Configuration; recorrer greenhouses
+    carga todos los que falten.
+
+    loader(entry, configuration) arma el Greenhouse de un GreenhouseEntry.
+    """
+
+    def __init__(self, loader):
+        self._drones = Configuration()  # Drones y su índice por id
+        self.all_drones = self._drones.all_drones
+        self._entries = SimpleList()  # GreenhouseEntry en el orden del archivo
+        self._entries_by_name = HashMap()
+        self._loader = loader
+        self._lock = threading.Lock()  # Dos pedidos no cargan el mismo invernadero
+        self._all_loaded = None  # SimpleList de Greenhouse cuando ya se cargaron todos
+
+    def add_drone(self, drone):
+        self._drones.add_drone(drone)
+
+    def get_drone_by_id(self, drone_id):
+        """Buscar dron por ID"""
+        return self._drones.get_drone_by_id(drone_id)
+
+    def add_entry(self, entry):
+        self._entries.add(entry)
+        # Si el nombre se repite, se conserva el primero (como Configuration)
+        if not self._entries_by_name.contains(entry.name):
+            self._entries_by_name.put(entry.name, entry)
+
+    @property
+    def greenhouses(self):
+        """Todos los invernaderos (carga los que falten); sin los que no se pudieron cargar"""
+        if self._all_loaded is None:
+            loaded = SimpleList()
+            for entry in self._entries:
+                greenhouse = self._load(entry)
+                if greenhouse is not None:
+                    loaded.add(greenhouse)
+            self._all_loaded = loaded
+        return self._all_loaded
+
+    def get_greenhouse_by_name(self, name):
+        """Buscar invernadero por nombre (se parsea si todavía no se cargó)"""
+        entry = self._entries_by_name.get(name)
+        if entry is None:
+            return None
+        return self._load(entry)
+
+    def has_greenhouse(self, name):
+        entry = self._entries_by_name.get(name)
+        return entry is not None and entry.error is None
+
+    def get_greenhouse_summaries(self):
+        """
+        SimpleList de GreenhouseSummary sin cargar los invernaderos (salvo que
+        haga falta contar). Los que ya fallaron al cargar no se listan, igual
+        que en greenhouses.
+        """
+        summaries = SimpleList()
+        for entry in self._entries:
+            if entry.error is not None:
+                continue
+            if entry.greenhouse is not None:
+                summaries.add(entry.greenhouse.get_summary())
+            elif entry.summary is not None:
+                summaries.add(entry.summary)
+            else:
+                greenhouse = self._load(entry)
+                if greenhouse is not None:
+                    summaries.add(greenhouse.get_summary())
+        return summaries
+
+    def get_loaded_count(self):
+        """Cantidad de invernaderos ya parseados"""
+        count = 0
+        for entry in self._entries:
+            if entry.greenhouse is not None:
+                count += 1
+        return count
+
+    def _load(self, entry):
+        with self._lock:
+            if entry.greenhouse is None and entry.error is None:
+                try:
+                    entry.greenhouse = self._loader(entry, self)
+                except Exception as e:
+                    entry.error = str(e)
+                    print(f"Error cargando invernadero '{entry.name}': {e}")
+            return entry.greenhouse
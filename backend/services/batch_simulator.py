@@ -0,0 +1,196 @@
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se usa el simulador por eventos
+    np = None
+
+from services.simulator import SEQUENTIAL_MODE, CONCURRENT_MODE, validate_simulation_mode
+
+def is_batch_available():
+    """True si NumPy está instalado y se puede usar BatchPlanSimulator"""
+    return np is not None
+
+class PlanSummary:
+    """Totales de un plan evaluado en lote"""
+    __slots__ = ("name", "total_time", "total_water", "total_fertilizer", "error")
+
+    def __init__(self, name, total_time=0, total_water=0, total_fertilizer=0, error=None):
+        self.name = name
+        self.total_time = total_time
+        self.total_water = total_water
+        self.total_fertilizer = total_fertilizer
+        self.error = error  # Mensaje si el plan no se pudo simular
+
+class BatchSimulationResult:
+    """Totales de muchos planes en arreglos NumPy (una fila por plan)"""
+
+    def __init__(self, names, total_times, total_water, total_fertilizer,
+                 water_by_drone, fertilizer_by_drone, plants_by_drone, valid):
+        self.names = names
+        self.total_times = total_times
+        self.total_water = total_water
+        self.total_fertilizer = total_fertilizer
+        # Matrices plan x dron, en el orden de greenhouse.drones
+        self.water_by_drone = water_by_drone
+        self.fertilizer_by_drone = fertilizer_by_drone
+        self.plants_by_drone = plants_by_drone
+        self.valid = valid  # False si el plan usa una hilera sin dron
+
+    def get_size(self):
+        return len(self.names)
+
+    def get_summary(self, index):
+        if not self.valid[index]:
+            return PlanSummary(self.names[index], error="El plan usa una hilera sin dron asignado")
+        return PlanSummary(
+            self.names[index], int(self.total_times[index]),
+            float(self.total_water[index]), float(self.total_fertilizer[index])
+        )
+
+class BatchPlanSimulator:
+    """
+    Evalúa muchos planes de un mismo invernadero a la vez con NumPy.
+    Los planes se codifican como matrices de enteros (plan x tarea) y las
+    distancias de cada tarea salen de np.diff sobre las posiciones de cada
+    dron en orden. Da los mismos totales que simulate_plan.
+
+    En modo secuencial el tiempo es tareas + suma de distancias; en modo
+    concurrente se recorre tarea por tarea pero vectorizado sobre los planes.
+    """
+
+    def __init__(self, greenhouse, mode=SEQUENTIAL_MODE):
+        if np is None:
+            raise RuntimeError("BatchPlanSimulator requiere NumPy (pip install numpy)")
+        self.greenhouse = greenhouse
+        self.mode = validate_simulation_mode(mode)
+        self.compiled = greenhouse.get_compiled()
+        self.drone_count = self.compiled.drone_count
+
+        # Arreglos NumPy a partir del invernadero compilado
+        self.drone_by_row = np.frombuffer(self.compiled.drone_index_by_row, dtype=np.int32).astype(np.int64)
+        self.water = np.frombuffer(self.compiled.water, dtype=np.float64)
+        self.fertilizer = np.frombuffer(self.compiled.fertilizer, dtype=np.float64)
+        self.has_plant = np.frombuffer(self.compiled.has_plant, dtype=np.uint8).astype(bool)
+
+    def encode_plans(self, irrigation_plans):
+        """Matrices (hileras, posiciones) de plan x tarea, rellenas con 0, y largos"""
+        plans = list(irrigation_plans)
+        lengths = np.array([plan.get_task_count() for plan in plans], dtype=np.int64)
+        width = int(lengths.max()) if len(plans) else 0
+        rows = np.zeros((len(plans), width), dtype=np.int64)
+        positions = np.zeros((len(plans), width), dtype=np.int64)
+        for plan_index, plan in enumerate(plans):
+            plan.check_syntax()
+            length = lengths[plan_index]
+            if length:
+                # Las tareas ya están empacadas en arreglos 'I': copia sin recorrer tuplas
+                rows[plan_index, :length] = np.frombuffer(plan.tasks.rows, dtype=np.uint32)
+                positions[plan_index, :length] = np.frombuffer(plan.tasks.positions, dtype=np.uint32)
+        return rows, positions, lengths
+
+    def simulate_plans(self, irrigation_plans):
+        """Totales de todos los planes en una sola llamada"""
+        plans = list(irrigation_plans)
+        names = [plan.name for plan in plans]
+        rows, positions, lengths = self.encode_plans(plans)
+        plan_count, width = rows.shape
+
+        in_plan = np.arange(width) < lengths[:, None]
+        drones, cells = self._lookup(rows, positions, in_plan)
+        valid = ~np.any(in_plan & (drones < 0), axis=1)
+        active = in_plan & valid[:, None]
+
+        distances = self._travel_distances(positions, drones, active)
+
+        if self.mode == CONCURRENT_MODE:
+            total_times = self._concurrent_times(drones, distances, active)
+        else:
+            # Cada tarea: |distancia| segundos de movimiento + 1 de riego
+            total_times = np.where(valid, lengths + distances.sum(axis=1), 0)
+
+        water_by_drone, fertilizer_by_drone, plants_by_drone = self._drone_resources(
+            drones, cells, active, plan_count
+        )
+
+        # Misma suma que _calculate_totals: dron por dron en orden
+        total_water = np.zeros(plan_count, dtype=np.float64)
+        total_fertilizer = np.zeros(plan_count, dtype=np.float64)
+        for drone_index in range(self.drone_count):
+            total_water = total_water + water_by_drone[:, drone_index]
+            total_fertilizer = total_fertilizer + fertilizer_by_drone[:, drone_index]
+
+        return BatchSimulationResult(
+            names, total_times, total_water, total_fertilizer,
+            water_by_drone, fertilizer_by_drone, plants_by_drone, valid
+        )
+
+    def _travel_distances(self, positions, drones, active):
+        """|posición - posición anterior del mismo dron| para cada tarea (0 fuera del plan)"""
+        distances = np.zeros(positions.shape, dtype=np.int64)
+        flat = np.flatnonzero(active)
+        if len(flat) == 0:
+            return distances
+
+        # Agrupar las tareas por (plan, dron) manteniendo el orden del plan
+        plan_indices = flat // positions.shape[1]
+        keys = plan_indices * (self.drone_count + 1) + drones.ravel()[flat]
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        sorted_positions = positions.ravel()[flat][order]
+
+        steps = np.diff(sorted_positions, prepend=0)
+        # La primera tarea de cada dron sale desde la posición 0
+        group_starts = np.empty(len(sorted_keys), dtype=bool)
+        group_starts[0] = True
+        group_starts[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        steps = np.where(group_starts, sorted_positions, steps)
+
+        distances.ravel()[flat[order]] = np.abs(steps)
+        return distances
+
+    def _concurrent_times(self, drones, distances, active):
+        """riego = max(riego anterior + 1, fin del dron + 1 + distancia), por columnas"""
+        plan_count, width = drones.shape
+        plan_range = np.arange(plan_count)
+        current_time = np.zeros(plan_count, dtype=np.int64)
+        free_times = np.zeros((plan_count, self.drone_count + 1), dtype=np.int64)
+
+        for task_index in range(width):
+            mask = active[:, task_index]
+            drone_column = np.where(mask, drones[:, task_index], self.drone_count)
+            arrival = free_times[plan_range, drone_column] + 1 + distances[:, task_index]
+            current_time = np.where(mask, np.maximum(current_time + 1, arrival), current_time)
+            free_times[plan_range, drone_column] = current_time
+        return current_time
+
+    def _lookup(self, rows, positions, in_plan):
+        """Índice de dron y celda de planta (-1 si no hay) de cada tarea"""
+        compiled = self.compiled
+        in_rows = (rows >= 1) & (rows <= compiled.num_rows)
+        drones = np.where(in_rows, self.drone_by_row[np.where(in_rows, rows, 0)], -1)
+
+        in_grid = in_rows & (positions >= 1) & (positions <= compiled.plants_per_row)
+        cells = np.where(in_grid, rows * compiled.width + positions, 0)
+        cells = np.where(in_grid & self.has_plant[cells], cells, -1)
+
+        # Hileras o plantas fuera de las dimensiones declaradas (casos raros)
+        for plan_index, task_index in zip(*np.nonzero(in_plan & ~in_grid)):
+            row = int(rows[plan_index, task_index])
+            position = int(positions[plan_index, task_index])
+            drones[plan_index, task_index] = compiled.get_drone_index_for_row(row)
+            cells[plan_index, task_index] = compiled.get_plant_cell(row, position)
+        return drones, cells
+
+    def _drone_resources(self, drones, cells, active, plan_count):
+        """Agua, fertilizante y plantas por plan y dron, sumados en orden de tareas"""
+        plan_indices, task_indices = np.nonzero(active & (cells >= 0))
+        drone_indices = drones[plan_indices, task_indices]
+        task_cells = cells[plan_indices, task_indices]
+
+        water = np.zeros((plan_count, self.drone_count), dtype=np.float64)
+        fertilizer = np.zeros((plan_count, self.drone_count), dtype=np.float64)
+        plants = np.zeros((plan_count, self.drone_count), dtype=np.int64)
+        # np.add.at suma en el orden de los índices, igual que el simulador
+        np.add.at(water, (plan_indices, drone_indices), self.water[task_cells])
+        np.add.at(fertilizer, (plan_indices, drone_indices), self.fertilizer[task_cells])
+        np.add.at(plants, (plan_indices, drone_indices), 1)
+        return water, fertilizer, plants
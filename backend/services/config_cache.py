@@ -0,0 +1,217 @@
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from array import array
+
+from data_structures.hash_map import HashMap
+from data_structures.packed_tasks import PackedTasks
+from models.drone import Drone
+from models.plant import Plant
+from models.greenhouse import Greenhouse
+from models.irrigation_plan import IrrigationPlan
+from models.configuration import Configuration
+
+def file_sha256(file_path):
+    """Huella SHA-256 del contenido de un archivo"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ConfigurationCache:
+    """
+    Caché en disco de configuraciones ya parseadas, un archivo por SHA-256
+    del XML. Se guarda en columnas (arreglos binarios y tuplas) con marshal
+    y las tareas de los planes ya compiladas, así que cargar no vuelve a
+    parsear XML ni planes.
+
+    El encabezado lleva el formato, el parser y su VERSION y la versión de
+    Python; si algo cambia la entrada se ignora y se vuelve a parsear. Una
+    entrada que no se puede leer se borra. Se guardan a lo sumo max_entries
+    archivos: al escribir se borran los usados hace más tiempo.
+    """
+
+    FORMAT_VERSION = 2
+    MAGIC = b"IPC2CFG\n"
+    # backend/cache, sin importar desde dónde se ejecute la aplicación
+    DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache")
+    MAX_ENTRIES = 32
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_entries=MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, xml_file_path, parser):
+        """Configuration del XML, desde el caché si existe; si no, parsear y guardar"""
+        digest = file_sha256(xml_file_path)
+        header = self._header(parser)
+
+        config = self._read(digest, header)
+        if config is not None:
+            self.hits += 1
+            return config
+
+        self.misses += 1
+        config = parser.parse_configuration_file(xml_file_path)
+        if config is not None:
+            try:
+                self._write(digest, header, config)
+                self._prune()
+            except Exception as e:
+                print(f"No se pudo guardar la configuración en caché: {e}")
+        return config
+
+    def get_stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def _header(self, parser):
+        return (self.FORMAT_VERSION, type(parser).__name__, parser.VERSION,
+                marshal.version, sys.version_info[:2])
+
+    def _path(self, digest):
+        return os.path.join(self.directory, f"{digest}.cfg")
+
+    def _read(self, digest, header):
+        path = self._path(digest)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                if f.read(len(self.MAGIC)) != self.MAGIC:
+                    raise ValueError("encabezado desconocido")
+                stored_header, data = marshal.load(f)
+            if tuple(stored_header) != header:
+                return None  # Otro parser, formato o Python: volver a parsear
+            config = self._decode(data)
+            os.utime(path)  # Usada recién: es la última en borrarse al podar
+            return config
+        except Exception as e:
+            # Cualquier dato dañado (índices, tipos, tamaños): borrar la entrada y volver a parsear
+            print(f"Caché de configuración inválido, se vuelve a parsear: {e}")
+            self._remove(path)
+            return None
+
+    def _write(self, digest, header, config):
+        os.makedirs(self.directory, exist_ok=True)
+        payload = marshal.dumps((header, self._encode(config)))
+        # Escribir en un temporal y reemplazar: nadie lee un archivo a medias
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                f.write(self.MAGIC)
+                f.write(payload)
+            os.replace(temp_path, self._path(digest))
+        except BaseException:
+            self._remove(temp_path)
+            raise
+
+    def _prune(self):
+        """Borrar las entradas usadas hace más tiempo si hay más de max_entries"""
+        entries = []
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(".cfg"):
+                path = os.path.join(self.directory, file_name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    pass  # Otro proceso la borró
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            self._remove(path)
+
+    def _remove(self, path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def _encode(self, config):
+        """Configuration -> tuplas, números y bytes (lo que acepta marshal)"""
+        drone_indices = HashMap()  # Drone -> posición en all_drones
+        drones = []
+        for drone_index, drone in enumerate(config.all_drones):
+            drone_indices.put(drone, drone_index)
+            drones.append((drone.id, drone.name))
+
+        greenhouses = []
+        for greenhouse in config.greenhouses:
+            rows = array('q')  # Con signo: el XML no valida hileras negativas
+            positions = array('q')
+            water = array('d')
+            fertilizer = array('d')
+            plant_types = []
+            for plant in greenhouse.plants:
+                rows.append(plant.row)
+                positions.append(plant.position)
+                water.append(plant.water_liters)
+                fertilizer.append(plant.fertilizer_grams)
+                plant_types.append(plant.plant_type)
+
+            assigned = tuple(
+                (drone_indices.get(drone), row)
+                for drone, row in zip(greenhouse.drones, greenhouse.drone_rows)
+            )
+
+            # Un plan con tareas mal escritas se guarda sin tareas y se vuelve a compilar al leer
+            plans = tuple(
+                (plan.name, plan.plan_string, plan.tasks.rows.tobytes(), plan.tasks.positions.tobytes())
+                if plan.syntax_issues.is_empty() else (plan.name, plan.plan_string, None, None)
+                for plan in greenhouse.irrigation_plans
+            )
+
+            greenhouses.append((
+                greenhouse.name, greenhouse.num_rows, greenhouse.plants_per_row,
+                (rows.tobytes(), positions.tobytes(), water.tobytes(), fertilizer.tobytes(), tuple(plant_types)),
+                assigned, plans
+            ))
+        return tuple(drones), tuple(greenhouses)
+
+    def _decode(self, data):
+        """Reconstruir la Configuration guardada por _encode"""
+        drones, greenhouses = data
+        config = Configuration()
+        all_drones = []
+        for drone_id, drone_name in drones:
+            drone = Drone(drone_id, drone_name)
+            config.add_drone(drone)
+            all_drones.append(drone)
+
+        for name, num_rows, plants_per_row, plants, assigned, plans in greenhouses:
+            greenhouse = Greenhouse(name, num_rows, plants_per_row)
+
+            rows, positions, water, fertilizer, plant_types = plants
+            rows = self._array('q', rows)
+            positions = self._array('q', positions)
+            water = self._array('d', water)
+            fertilizer = self._array('d', fertilizer)
+            for index in range(len(rows)):
+                greenhouse.add_plant(Plant(rows[index], positions[index], water[index],
+                                           fertilizer[index], plant_types[index]))
+
+            for drone_index, row in assigned:
+                greenhouse.add_drone(all_drones[drone_index], row)
+
+            for plan_name, plan_string, row_bytes, position_bytes in plans:
+                if row_bytes is None:
+                    greenhouse.add_irrigation_plan(IrrigationPlan(plan_name, plan_string))
+                    continue
+                greenhouse.add_irrigation_plan(IrrigationPlan.from_tasks(plan_name, plan_string, PackedTasks(
+                    self._array('I', row_bytes), self._array('I', position_bytes)
+                )))
+
+            greenhouse.compile()
+            greenhouse.validate_plans()  # Los problemas ya se reportaron al parsear
+            config.add_greenhouse(greenhouse)
+        return config
+
+    def _array(self, typecode, data):
+        values = array(typecode)
+        values.frombytes(data)
+        return values
@@ -0,0 +1,244 @@
+from array import array
+
+from data_structures.simple_list import SimpleList
+from data_structures.segment_timeline import SegmentTimeline
+from data_structures.cumulative_stats import CumulativeStats
+from data_structures.columnar_timeline import MOVE_FORWARD, MOVE_BACKWARD, IRRIGATE
+from services.simulator import SimulationResult, DroneStatistics, SEQUENTIAL_MODE, CONCURRENT_MODE, validate_simulation_mode
+
+def timeline_builder(greenhouse, irrigation_plan, mode):
+    """Función que genera el timeline del plan la primera vez que se pide"""
+    return lambda: EventDrivenSimulator(greenhouse, mode).simulate_plan(irrigation_plan).timeline
+
+class SimulationCheckpoint:
+    """Estado de la simulación justo antes de procesar la tarea task_index"""
+    __slots__ = ("task_index", "current_time", "positions", "free_times",
+                 "water_used", "fertilizer_used", "plants_irrigated", "segment_counts")
+
+    def __init__(self, task_index, current_time, positions, free_times, drone_stats, segment_counts):
+        self.task_index = task_index
+        self.current_time = current_time
+        self.positions = array('I', positions)
+        self.free_times = array('I', free_times)
+        self.water_used = array('d', [stat.water_used for stat in drone_stats])
+        self.fertilizer_used = array('d', [stat.fertilizer_used for stat in drone_stats])
+        self.plants_irrigated = array('I', [stat.plants_irrigated for stat in drone_stats])
+        self.segment_counts = segment_counts  # Tramos por dron en el timeline, o None
+
+    def restore_statistics(self, drone_stats):
+        """Copiar las estadísticas acumuladas a las de una nueva corrida"""
+        for drone_index in range(len(drone_stats)):
+            stat = drone_stats[drone_index]
+            stat.water_used = self.water_used[drone_index]
+            stat.fertilizer_used = self.fertilizer_used[drone_index]
+            stat.plants_irrigated = self.plants_irrigated[drone_index]
+
+class EventDrivenSimulator:
+    """
+    Simulador por eventos: en lugar de avanzar segundo a segundo calcula
+    cuánto tarda cada tarea (|destino - posición| + 1 segundos) y guarda
+    tramos en un SegmentTimeline. El costo depende del número de tareas,
+    no de segundos x drones.
+
+    En modo concurrente cada dron sale hacia su próxima tarea apenas termina
+    la anterior, y riega en max(riego anterior + 1, llegada + 1).
+
+    Cada checkpoint_interval tareas se guarda un punto de control para poder
+    re-simular solo el final de un plan modificado.
+    """
+
+    CHECKPOINT_INTERVAL = 64
+
+    def __init__(self, greenhouse, mode=SEQUENTIAL_MODE, checkpoint_interval=CHECKPOINT_INTERVAL):
+        self.greenhouse = greenhouse
+        self.mode = validate_simulation_mode(mode)
+        self.checkpoint_interval = max(1, checkpoint_interval)
+        # Drones y recursos en arreglos planos (se compilan al cargar el XML)
+        self.compiled = greenhouse.get_compiled()
+        self.drone_count = self.compiled.drone_count
+
+    def simulate_plan(self, irrigation_plan):
+        """Ejecutar simulación completa del plan de riego"""
+        result = SimulationResult()
+        result.timeline = self._create_timeline()
+        self._run(irrigation_plan, result, result.timeline)
+        return result
+
+    def simulate_summary(self, irrigation_plan):
+        """
+        Solo tiempo total, agua, fertilizante y estadísticas por dron, en una
+        pasada O(tareas) sin generar acciones. El timeline se calcula
+        la primera vez que alguien lo pide.
+        """
+        result = SimulationResult(lambda: self.simulate_plan(irrigation_plan).timeline)
+        self._run(irrigation_plan, result, None)
+        return result
+
+    def resimulate_plan(self, previous_result, irrigation_plan):
+        """
+        Simular un plan modificado reutilizando un resultado anterior del mismo
+        invernadero: se retoma desde el último punto de control cuyo prefijo de
+        tareas coincide y solo se simula el sufijo que cambió.
+        """
+        checkpoint = self._find_resume_checkpoint(previous_result, irrigation_plan)
+        if checkpoint is None:
+            if previous_result is not None and not previous_result.has_timeline():
+                return self.simulate_summary(irrigation_plan)
+            return self.simulate_plan(irrigation_plan)
+
+        if previous_result.has_timeline() and checkpoint.segment_counts is not None:
+            # Reutilizar los tramos del prefijo y agregar los del sufijo
+            result = SimulationResult()
+            result.timeline = previous_result.timeline.copy_prefix(checkpoint.segment_counts)
+        else:
+            result = SimulationResult(lambda: self.simulate_plan(irrigation_plan).timeline)
+        result.irrigation_times = previous_result.irrigation_times[:checkpoint.task_index]
+        result.cumulative_stats = previous_result.cumulative_stats.copy_until(checkpoint.current_time)
+
+        # Los puntos de control del prefijo siguen siendo válidos (salvo uno
+        # al final del plan nuevo, que la simulación completa no guardaría)
+        for previous in previous_result.checkpoints:
+            if (previous.task_index > checkpoint.task_index
+                    or previous.task_index >= irrigation_plan.tasks.get_size()):
+                break
+            result.checkpoints.add(previous)
+
+        timeline = result.timeline if result.has_timeline() else None
+        self._run(irrigation_plan, result, timeline, checkpoint)
+        return result
+
+    def _create_timeline(self):
+        timeline = SegmentTimeline()
+        for drone_index, drone_name in enumerate(self.compiled.drone_names):
+            timeline.register_drone(drone_name, self.compiled.drone_rows[drone_index])
+        return timeline
+
+    def _create_cumulative_stats(self):
+        cumulative_stats = CumulativeStats()
+        for drone_name in self.compiled.drone_names:
+            cumulative_stats.register_drone(drone_name)
+        return cumulative_stats
+
+    def _find_resume_checkpoint(self, previous_result, irrigation_plan):
+        """Último punto de control cuyas tareas previas son iguales en ambos planes"""
+        if (previous_result is None or previous_result.plan_tasks is None
+                or previous_result.simulation_mode != self.mode):
+            return None
+
+        # Primera tarea distinta entre el plan anterior y el nuevo
+        first_difference = previous_result.plan_tasks.common_prefix_length(irrigation_plan.tasks)
+
+        best = None
+        for checkpoint in previous_result.checkpoints:
+            if checkpoint.task_index > first_difference:
+                break
+            best = checkpoint
+        return best
+
+    def _run(self, irrigation_plan, result, timeline, checkpoint=None):
+        """
+        Recorrer las tareas (desde el punto de control si se indica);
+        si timeline es None solo se calculan totales.
+        """
+        irrigation_plan.check_syntax()
+        drone_stats = self._initialize_drone_statistics()
+        stats_by_index = list(drone_stats)
+        concurrent = self.mode == CONCURRENT_MODE
+
+        # Estado propio de esta corrida
+        if checkpoint is None:
+            positions = [0] * self.drone_count
+            free_times = [0] * self.drone_count  # Último segundo ocupado de cada dron
+            current_time = 0  # Segundo del último riego
+            first_task = 0
+            irrigation_times = array('I')
+            cumulative_stats = self._create_cumulative_stats()
+        else:
+            positions = list(checkpoint.positions)
+            free_times = list(checkpoint.free_times)
+            current_time = checkpoint.current_time
+            first_task = checkpoint.task_index
+            # Prefijos copiados por resimulate_plan
+            irrigation_times = result.irrigation_times
+            cumulative_stats = result.cumulative_stats
+            checkpoint.restore_statistics(stats_by_index)
+
+        result.plan_tasks = irrigation_plan.tasks
+        result.simulation_mode = self.mode
+        tasks = irrigation_plan.tasks
+
+        for task_index in range(first_task, tasks.get_size()):
+            # Punto de control en el límite de la tarea, antes de procesarla
+            if task_index != first_task and task_index % self.checkpoint_interval == 0:
+                result.checkpoints.add(SimulationCheckpoint(
+                    task_index, current_time, positions, free_times, stats_by_index,
+                    timeline.get_segment_counts() if timeline is not None else None
+                ))
+
+            row, position = tasks.peek_at(task_index)
+            drone_index = self._get_drone_index_for_row(row)
+            current_position = positions[drone_index]
+
+            # El dron sale al terminar su tarea anterior (concurrente)
+            # o al terminar la tarea anterior del plan (secuencial)
+            move_start = (free_times[drone_index] if concurrent else current_time) + 1
+            distance = position - current_position
+
+            # Segundo de riego: después de llegar y después del riego anterior
+            current_time = max(current_time + 1, move_start + abs(distance))
+
+            if timeline is not None:
+                # Tramo de movimiento en forma cerrada
+                if distance > 0:
+                    timeline.add_segment(drone_index, move_start, distance, MOVE_FORWARD, current_position)
+                elif distance < 0:
+                    timeline.add_segment(drone_index, move_start, -distance, MOVE_BACKWARD, current_position)
+                timeline.add_segment(drone_index, current_time, 1, IRRIGATE, position)
+
+            positions[drone_index] = position
+            free_times[drone_index] = current_time
+            irrigation_times.append(current_time)
+
+            stat = stats_by_index[drone_index]
+            self._update_drone_statistics(stat, row, position)
+            cumulative_stats.record(drone_index, current_time, position,
+                                    stat.water_used, stat.fertilizer_used, stat.plants_irrigated)
+
+        result.total_time = current_time
+        result.irrigation_times = irrigation_times
+        result.cumulative_stats = cumulative_stats
+        result.drone_statistics = drone_stats
+        self._calculate_totals(result, drone_stats)
+
+    def _get_drone_index_for_row(self, row):
+        drone_index = self.compiled.get_drone_index_for_row(row)
+        if drone_index == -1:
+            raise ValueError(f"No hay dron asignado a la hilera {row}")
+        return drone_index
+
+    def _initialize_drone_statistics(self):
+        """Crear estadísticas iniciales para cada dron"""
+        stats = SimpleList()
+        for drone_name in self.compiled.drone_names:
+            stats.add(DroneStatistics(drone_name))
+        return stats
+
+    def _update_drone_statistics(self, stat, row, position):
+        """Sumar los recursos de la planta regada"""
+        cell = self.compiled.get_plant_cell(row, position)
+        if cell != -1:
+            stat.water_used += self.compiled.water[cell]
+            stat.fertilizer_used += self.compiled.fertilizer[cell]
+            stat.plants_irrigated += 1
+
+    def _calculate_totals(self, result, drone_stats):
+        """Calcular totales de agua y fertilizante"""
+        total_water = 0
+        total_fertilizer = 0
+
+        for stat in drone_stats:
+            total_water += stat.water_used
+            total_fertilizer += stat.fertilizer_used
+
+        result.total_water = total_water
+        result.total_fertilizer = total_fertilizer
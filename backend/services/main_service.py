@@ -1,14 +1,26 @@
 import sys
 import os
+import threading
 
 # Agregar paths
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'data_structures'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'utils'))
 
-from utils.xml_parser import XMLParser
-from services.simulator import DiscreteSimulator
+from utils.xml_stream_parser import StreamingXMLParser
+from utils.parallel_xml_parser import ParallelXMLParser
+from utils.lazy_xml_parser import LazyXMLParser
+from utils.xml_output_writer import XMLOutputWriter
+from models.irrigation_plan import IrrigationPlan
+from services.event_simulator import EventDrivenSimulator, timeline_builder
+from services.parallel_simulator import ParallelPlanExecutor
+from services.config_cache import ConfigurationCache
+from services.result_cache import SimulationResultCache, greenhouse_fingerprint, plan_fingerprint
+from services.state_index import SimulationStateIndex
+from services.batch_simulator import BatchPlanSimulator, PlanSummary, is_batch_available
+from services.simulator import DiscreteSimulator, SEQUENTIAL_MODE, validate_simulation_mode
 from data_structures.simple_list import SimpleList
+from data_structures.hash_map import HashMap
 
 # Clase para almacenar pares clave-valor usando TDAs propios
 class KeyValuePair:
@@ -17,35 +29,46 @@ class KeyValuePair:
         self.value = value
 
 class SimulationResultsStorage:
-    """Almacena resultados usando SimpleList en lugar de dict"""
+    """Almacena resultados usando TDAs propios en lugar de dict"""
     def __init__(self):
-        self.results = SimpleList()  # Lista de KeyValuePair
+        self.results = SimpleList()  # Lista de KeyValuePair (orden de inserción)
+        self.index = HashMap()  # clave -> KeyValuePair
+        self._lock = threading.Lock()  # Varias simulaciones pueden guardar a la vez
     
     def add_result(self, greenhouse_name, plan_name, result):
         key = f"{greenhouse_name}_{plan_name}"
-        pair = KeyValuePair(key, result)
-        self.results.add(pair)
+        with self._lock:
+            pair = self.index.get(key)
+            if pair:
+                # Re-simulación: reemplazar el resultado anterior
+                pair.value = result
+                return
+            pair = KeyValuePair(key, result)
+            self.results.add(pair)
+            self.index.put(key, pair)
     
     def get_result(self, greenhouse_name, plan_name):
         key = f"{greenhouse_name}_{plan_name}"
-        for i in range(self.results.get_size()):
-            pair = self.results.get(i)
-            if pair.key == key:
-                return pair.value
+        with self._lock:
+            pair = self.index.get(key)
+        if pair:
+            return pair.value
         return None
     
     def has_results(self):
         return not self.results.is_empty()
     
     def clear(self):
-        self.results = SimpleList()
+        with self._lock:
+            self.results = SimpleList()
+            self.index = HashMap()
     
     def get_all_results(self):
         """Retorna SimpleList de todos los resultados"""
         all_results = SimpleList()
-        for i in range(self.results.get_size()):
-            pair = self.results.get(i)
-            all_results.add(pair)
+        with self._lock:
+            for pair in self.results:
+                all_results.add(pair)
         return all_results
 
 class GreenhouseInfo:
@@ -64,19 +87,116 @@ class PlanInfo:
         self.name = name
         self.sequence = sequence
 
+class ReloadSummary:
+    """Qué pasó con los resultados al recargar una configuración"""
+    def __init__(self):
+        self.kept_results = 0  # Planes sin cambios: se conserva el resultado
+        self.resimulated_results = 0  # Planes con resultado que cambiaron
+        self.discarded_results = 0  # Planes o invernaderos que ya no existen
+        self.added_greenhouses = 0
+        self.changed_greenhouses = 0  # Con resultados y dimensiones, plantas o drones distintos
+        self.removed_greenhouses = 0
+
 class CompleteIrrigationService:
     """Servicio principal usando solo TDAs propios"""
     
-    def __init__(self):
-        self.xml_parser = XMLParser()
+    def __init__(self, simulation_mode=SEQUENTIAL_MODE, parallel_workers=1, parallel_chunk_size=1,
+                 result_cache_size=SimulationResultCache.DEFAULT_CAPACITY,
+                 config_cache_dir=ConfigurationCache.DEFAULT_DIRECTORY, parse_workers=1, lazy_loading=False):
+        if lazy_loading:
+            # Solo un índice del archivo; cada invernadero se parsea al pedirlo
+            self.xml_parser = LazyXMLParser()
+            config_cache_dir = None  # El caché guarda configuraciones completas
+        elif parse_workers and parse_workers > 1:
+            # Un proceso por invernadero para archivos con muchos invernaderos
+            self.xml_parser = ParallelXMLParser(parse_workers)
+        else:
+            self.xml_parser = StreamingXMLParser()  # iterparse: memoria de un invernadero a la vez
+        # Configuraciones ya parseadas por SHA-256 del XML (None lo desactiva)
+        self.config_cache = ConfigurationCache(config_cache_dir) if config_cache_dir else None
         self.current_configuration = None
         self.simulation_results = SimulationResultsStorage()
+        # Resultados por huella de contenido; sobrevive a recargas de configuración
+        self.result_cache = SimulationResultCache(result_cache_size)
+        self._greenhouse_hashes = HashMap()  # Greenhouse -> huella
+        self._hashes_lock = threading.Lock()
+        self.simulation_mode = validate_simulation_mode(simulation_mode)
+        # simulate_all_plans usa un pool de procesos si parallel_workers > 1
+        self.parallel_workers = parallel_workers
+        self.parallel_chunk_size = parallel_chunk_size
+    
+    def set_simulation_mode(self, mode):
+        """Cambiar el modo de simulación; los resultados del modo anterior se descartan"""
+        mode = validate_simulation_mode(mode)
+        if mode != self.simulation_mode:
+            self.simulation_mode = mode
+            self.simulation_results.clear()
+    
+    def get_state_at(self, greenhouse_name, plan_name, time_t, queue_limit=SimulationStateIndex.DEFAULT_QUEUE_LIMIT):
+        """
+        Estado del plan al final del segundo time_t: posición de cada dron,
+        tareas pendientes y agua/fertilizante acumulados. Simula el plan si
+        todavía no tiene resultado.
+        """
+        if not self.current_configuration:
+            return None
+        
+        greenhouse = self.current_configuration.get_greenhouse_by_name(greenhouse_name)
+        if not greenhouse:
+            return None
+        
+        result = self.get_simulation_result(greenhouse_name, plan_name)
+        if result is None or result.cumulative_stats is None:
+            # Resultado sin datos de riego por segundo
+            result = self.simulate_specific_plan(greenhouse_name, plan_name, summary_only=True)
+            if result is None:
+                return None
+        
+        return self._get_state_index(greenhouse, result).state_at(time_t, queue_limit)
+    
+    def get_stats_between(self, greenhouse_name, plan_name, first_second, last_second):
+        """Agua, fertilizante y plantas de cada dron entre dos segundos (inclusive)"""
+        if not self.current_configuration:
+            return None
+        
+        greenhouse = self.current_configuration.get_greenhouse_by_name(greenhouse_name)
+        if not greenhouse:
+            return None
+        
+        result = self.get_simulation_result(greenhouse_name, plan_name)
+        if result is None or result.cumulative_stats is None:
+            result = self.simulate_specific_plan(greenhouse_name, plan_name, summary_only=True)
+            if result is None:
+                return None
+        
+        return self._get_state_index(greenhouse, result).stats_between(first_second, last_second)
+    
+    def get_plan_issues(self, greenhouse_name, plan_name):
+        """PlanIssue de un plan (hileras sin dron o fuera de las dimensiones), validados al cargar"""
+        if not self.current_configuration:
+            return None
+        
+        greenhouse = self.current_configuration.get_greenhouse_by_name(greenhouse_name)
+        if not greenhouse:
+            return None
+        
+        plan = greenhouse.get_plan_by_name(plan_name)
+        if not plan:
+            return None
+        return plan.issues
+    
+    def _get_state_index(self, greenhouse, result):
+        """Índice de estados del resultado, creado en la primera consulta"""
+        if result.state_index is None:
+            result.state_index = SimulationStateIndex(greenhouse, result)
+        return result.state_index
     
     def generate_tda_graph(self, greenhouse_name, plan_name, time_t):
         """Generar gráfico Graphviz para un plan simulado"""
         try:
+            state = self.get_state_at(greenhouse_name, plan_name, time_t)
             result = self.get_simulation_result(greenhouse_name, plan_name)
-            if not result:
+            if not result or state is None:
                 return None
             
             # Importar el generador de gráficos
@@ -92,7 +212,7 @@ class CompleteIrrigationService:
             output_path = os.path.join(output_dir, f"{filename_base}.dot")
             
             # Generar el gráfico
-            png_path, dot_path = generator.generate_tda_graph(result, time_t, output_path)
+            png_path, dot_path = generator.generate_tda_graph(result, time_t, output_path, state)
             
             return png_path or dot_path  # Retornar PNG si existe, sino DOT
             
@@ -103,7 +223,8 @@ class CompleteIrrigationService:
     def load_configuration_file(self, xml_file_path):
         """Cargar configuración desde archivo XML"""
         try:
-            self.current_configuration = self.xml_parser.parse_configuration_file(xml_file_path)
+            self.current_configuration = self._read_configuration(xml_file_path)
+            self._greenhouse_hashes = HashMap()
             if self.current_configuration:
                 self.simulation_results.clear()
                 return True
@@ -112,6 +233,121 @@ class CompleteIrrigationService:
             print(f"Error cargando configuración: {e}")
             return False
     
+    def reload_configuration_file(self, xml_file_path):
+        """
+        Cargar un XML nuevo conservando los resultados que siguen siendo
+        válidos. Se compara invernadero por invernadero (huella de
+        dimensiones, plantas y drones) y plan por plan (tareas): un plan igual
+        en un invernadero igual conserva su resultado; los planes que tenían
+        resultado y cambiaron se vuelven a simular (desde el último punto de
+        control común si el invernadero no cambió). Los planes nunca simulados
+        siguen sin simular. Retorna ReloadSummary, o None si el XML no se pudo
+        cargar (la configuración actual no cambia).
+        """
+        try:
+            new_configuration = self._read_configuration(xml_file_path)
+        except Exception as e:
+            print(f"Error cargando configuración: {e}")
+            return None
+        if not new_configuration:
+            return None
+        
+        summary = ReloadSummary()
+        old_configuration = self.current_configuration
+        new_hashes = HashMap()  # Greenhouse nuevo -> huella
+        entries = SimpleList()  # (invernadero, plan, resultado) en el orden del XML nuevo
+        
+        seen_names = HashMap()
+        # Con carga diferida solo se parsean los invernaderos que tenían resultados
+        for greenhouse_summary in new_configuration.get_greenhouse_summaries():
+            name = greenhouse_summary.name
+            if seen_names.contains(name):
+                continue  # Nombre repetido: vale el primero, como en get_greenhouse_by_name
+            seen_names.put(name, True)
+            if old_configuration is None or not old_configuration.has_greenhouse(name):
+                summary.added_greenhouses += 1
+                continue
+            
+            had_results = False
+            for plan_name, _ in greenhouse_summary.plans:
+                if self.simulation_results.get_result(name, plan_name) is not None:
+                    had_results = True
+                    break
+            if not had_results:
+                continue  # Nada que conservar ni volver a simular
+            
+            greenhouse = new_configuration.get_greenhouse_by_name(name)
+            old_greenhouse = old_configuration.get_greenhouse_by_name(name)
+            if greenhouse is None or old_greenhouse is None:
+                continue  # No se pudo cargar: sus resultados se descartan
+            
+            greenhouse_hash = greenhouse_fingerprint(greenhouse)
+            new_hashes.put(greenhouse, greenhouse_hash)
+            same_greenhouse = greenhouse_hash == self._get_greenhouse_hash(old_greenhouse)
+            if not same_greenhouse:
+                summary.changed_greenhouses += 1
+            
+            simulator = None
+            for plan in greenhouse.irrigation_plans:
+                previous_result = self.simulation_results.get_result(greenhouse.name, plan.name)
+                if previous_result is None:
+                    continue  # Nunca se simuló: se simula cuando alguien lo pida
+                if plan.has_blocking_issues():
+                    continue  # Ya no se puede simular (se reportó al cargar): se descarta
+                
+                old_plan = old_greenhouse.get_plan_by_name(plan.name)
+                if same_greenhouse and old_plan is not None and old_plan.tasks.equals(plan.tasks):
+                    # Mismo resultado, pero su timeline se generaría con el invernadero anterior
+                    previous_result = previous_result.detach().attach(
+                        timeline_builder(greenhouse, plan, self.simulation_mode)
+                    )
+                    entries.add((greenhouse, plan, previous_result))
+                    summary.kept_results += 1
+                    continue
+                
+                fingerprint = plan_fingerprint(greenhouse_hash, plan, self.simulation_mode)
+                result = self.result_cache.get(fingerprint, timeline_builder(greenhouse, plan, self.simulation_mode))
+                if result is None:
+                    if simulator is None:
+                        simulator = EventDrivenSimulator(greenhouse, self.simulation_mode)
+                    try:
+                        if same_greenhouse:
+                            result = simulator.resimulate_plan(previous_result, plan)
+                        elif previous_result.has_timeline():
+                            result = simulator.simulate_plan(plan)
+                        else:
+                            result = simulator.simulate_summary(plan)
+                    except Exception as e:
+                        print(f"Error en simulación de {greenhouse.name}/{plan.name}: {e}")
+                        continue
+                    self.result_cache.put(fingerprint, result)
+                entries.add((greenhouse, plan, result))
+                summary.resimulated_results += 1
+        
+        if old_configuration:
+            for old_summary in old_configuration.get_greenhouse_summaries():
+                if not new_configuration.has_greenhouse(old_summary.name):
+                    summary.removed_greenhouses += 1
+        summary.discarded_results = (self.simulation_results.results.get_size()
+                                     - summary.kept_results - summary.resimulated_results)
+        
+        results = SimulationResultsStorage()
+        for greenhouse, plan, result in entries:
+            results.add_result(greenhouse.name, plan.name, result)
+        
+        # Cambiar todo junto al final: si algo falló antes, queda la configuración anterior
+        self.current_configuration = new_configuration
+        self.simulation_results = results
+        with self._hashes_lock:
+            self._greenhouse_hashes = new_hashes
+        return summary
+    
+    def _read_configuration(self, xml_file_path):
+        """Configuration del XML (desde el caché en disco si está activo)"""
+        if self.config_cache:
+            return self.config_cache.load(xml_file_path, self.xml_parser)
+        return self.xml_parser.parse_configuration_file(xml_file_path)
+    
     def get_available_greenhouses(self):
         """Obtener lista de invernaderos usando TDAs"""
         if not self.current_configuration:
@@ -119,30 +355,32 @@ class CompleteIrrigationService:
         
         greenhouses_list = SimpleList()
         
-        for i in range(self.current_configuration.greenhouses.get_size()):
-            greenhouse = self.current_configuration.greenhouses.get(i)
+        # Resúmenes: con carga diferida no hace falta parsear los invernaderos
+        for summary in self.current_configuration.get_greenhouse_summaries():
             
             # Crear info del invernadero
             greenhouse_info = GreenhouseInfo(
-                greenhouse.name,
-                greenhouse.num_rows,
-                greenhouse.plants_per_row,
-                greenhouse.plants.get_size(),
-                greenhouse.drones.get_size()
+                summary.name,
+                summary.num_rows,
+                summary.plants_per_row,
+                summary.plant_count,
+                summary.drone_count
             )
             
             # Agregar planes
-            for j in range(greenhouse.irrigation_plans.get_size()):
-                plan = greenhouse.irrigation_plans.get(j)
-                plan_info = PlanInfo(plan.name, plan.plan_string)
+            for plan_name, plan_string in summary.plans:
+                plan_info = PlanInfo(plan_name, plan_string)
                 greenhouse_info.plans.add(plan_info)
             
             greenhouses_list.add(greenhouse_info)
         
         return greenhouses_list
     
-    def simulate_specific_plan(self, greenhouse_name, plan_name):
-        """Simular plan específico"""
+    def simulate_specific_plan(self, greenhouse_name, plan_name, summary_only=False):
+        """
+        Simular plan específico. Con summary_only solo se calculan los totales;
+        el timeline se genera cuando un detalle, reporte o gráfico lo pida.
+        """
         if not self.current_configuration:
             return None
         
@@ -152,20 +390,24 @@ class CompleteIrrigationService:
             return None
         
         # Buscar plan
-        target_plan = None
-        for i in range(greenhouse.irrigation_plans.get_size()):
-            plan = greenhouse.irrigation_plans.get(i)
-            if plan.name == plan_name:
-                target_plan = plan
-                break
+        target_plan = greenhouse.get_plan_by_name(plan_name)
         
         if not target_plan:
             return None
         
         try:
-            # Ejecutar simulación
-            simulator = DiscreteSimulator(greenhouse)
-            result = simulator.simulate_plan(target_plan)
+            # Reutilizar un resultado idéntico ya simulado
+            fingerprint = self.get_plan_fingerprint(greenhouse, target_plan)
+            result = self.result_cache.get(fingerprint, timeline_builder(greenhouse, target_plan, self.simulation_mode))
+            
+            if result is None:
+                # Ejecutar simulación
+                simulator = EventDrivenSimulator(greenhouse, self.simulation_mode)
+                if summary_only:
+                    result = simulator.simulate_summary(target_plan)
+                else:
+                    result = simulator.simulate_plan(target_plan)
+                self.result_cache.put(fingerprint, result)
             
             # Guardar resultado usando TDA propio
             self.simulation_results.add_result(greenhouse_name, plan_name, result)
@@ -175,18 +417,143 @@ class CompleteIrrigationService:
             print(f"Error en simulación: {e}")
             return None
     
+    def update_plan(self, greenhouse_name, plan_name, plan_string):
+        """
+        Cambiar la secuencia de un plan y re-simularlo. Si ya había un
+        resultado, se retoma desde su último punto de control con el mismo
+        prefijo de tareas y solo se simula el final modificado.
+        """
+        if not self.current_configuration:
+            return None
+        
+        greenhouse = self.current_configuration.get_greenhouse_by_name(greenhouse_name)
+        if not greenhouse or not greenhouse.get_plan_by_name(plan_name):
+            return None
+        
+        try:
+            new_plan = IrrigationPlan(plan_name, plan_string)
+            # Validar antes de reemplazar: un plan sin dron para alguna hilera no se simula
+            new_plan.validate(greenhouse.get_compiled())
+            if new_plan.has_blocking_issues():
+                for issue in new_plan.issues:
+                    print(f"Plan '{plan_name}' de '{greenhouse_name}': {issue.to_string()}")
+                return None
+            previous_result = self.get_simulation_result(greenhouse_name, plan_name)
+            greenhouse.replace_irrigation_plan(new_plan)
+            
+            fingerprint = self.get_plan_fingerprint(greenhouse, new_plan)
+            result = self.result_cache.get(fingerprint, timeline_builder(greenhouse, new_plan, self.simulation_mode))
+            if result is None:
+                simulator = EventDrivenSimulator(greenhouse, self.simulation_mode)
+                result = simulator.resimulate_plan(previous_result, new_plan)
+                self.result_cache.put(fingerprint, result)
+            
+            self.simulation_results.add_result(greenhouse_name, plan_name, result)
+            return result
+        except Exception as e:
+            print(f"Error actualizando plan: {e}")
+            return None
+    
+    def iter_plan_actions(self, greenhouse_name, plan_name):
+        """
+        Generador de (segundo, acciones) de un plan sin guardar el resultado,
+        para consumir planes muy largos con memoria constante.
+        """
+        if not self.current_configuration:
+            return None
+        
+        greenhouse = self.current_configuration.get_greenhouse_by_name(greenhouse_name)
+        if not greenhouse:
+            return None
+        
+        target_plan = greenhouse.get_plan_by_name(plan_name)
+        if not target_plan:
+            return None
+        
+        # Igual que update_plan: un plan con hileras sin dron no se simula
+        target_plan.validate(greenhouse.get_compiled())
+        if target_plan.has_blocking_issues():
+            for issue in target_plan.issues:
+                if issue.blocking:
+                    print(f"Plan '{plan_name}' de '{greenhouse_name}': {issue.to_string()}")
+            return None
+        
+        simulator = DiscreteSimulator(greenhouse, self.simulation_mode)
+        return simulator.iter_plan(target_plan)
+    
+    def evaluate_candidate_plans(self, greenhouse_name, plan_strings):
+        """
+        Totales (tiempo, agua, fertilizante) de muchos planes candidatos para
+        un invernadero, sin guardarlos como resultados. Con NumPy se evalúan
+        todos en una llamada; sin él, uno por uno con el simulador por eventos.
+        Retorna SimpleList de PlanSummary en el mismo orden.
+        """
+        if not self.current_configuration:
+            return None
+        
+        greenhouse = self.current_configuration.get_greenhouse_by_name(greenhouse_name)
+        if not greenhouse:
+            return None
+        
+        summaries = HashMap()  # índice del candidato -> PlanSummary
+        plans = SimpleList()
+        plan_indices = SimpleList()
+        compiled = greenhouse.get_compiled()
+        for index, plan_string in enumerate(plan_strings):
+            name = f"candidato_{index + 1}"
+            plan = IrrigationPlan(name, plan_string)
+            
+            plan.validate(compiled)
+            if plan.has_blocking_issues():
+                for issue in plan.issues:
+                    if issue.blocking:
+                        summaries.put(index, PlanSummary(name, error=issue.to_string()))
+                        break
+            else:
+                plans.add(plan)
+                plan_indices.add(index)
+        
+        if is_batch_available():
+            batch = BatchPlanSimulator(greenhouse, self.simulation_mode).simulate_plans(plans)
+            for position, index in enumerate(plan_indices):
+                summaries.put(index, batch.get_summary(position))
+        else:
+            simulator = EventDrivenSimulator(greenhouse, self.simulation_mode)
+            for plan, index in zip(plans, plan_indices):
+                try:
+                    result = simulator.simulate_summary(plan)
+                    summaries.put(index, PlanSummary(
+                        plan.name, result.total_time, result.total_water, result.total_fertilizer
+                    ))
+                except ValueError as e:
+                    summaries.put(index, PlanSummary(plan.name, error=str(e)))
+        
+        ordered = SimpleList()
+        for index in range(summaries.get_size()):
+            ordered.add(summaries.get(index))
+        return ordered
+    
     def simulate_all_plans(self):
         """Simular todos los planes usando TDAs"""
         if not self.current_configuration:
             return False
         
         try:
-            for i in range(self.current_configuration.greenhouses.get_size()):
-                greenhouse = self.current_configuration.greenhouses.get(i)
+            if self.parallel_workers and self.parallel_workers > 1:
+                executor = ParallelPlanExecutor(self.parallel_workers, self.parallel_chunk_size, self.simulation_mode)
+                errors = executor.simulate_configuration(
+                    self.current_configuration, self.simulation_results,
+                    self.result_cache, self.get_plan_fingerprint
+                )
+                # Los procesos no imprimen: los errores se reportan aquí
+                for greenhouse_name, plan_name, message in errors:
+                    print(f"Error en simulación de {greenhouse_name}/{plan_name}: {message}")
+                return True
+            
+            for greenhouse in self.current_configuration.greenhouses:
                 
-                for j in range(greenhouse.irrigation_plans.get_size()):
-                    plan = greenhouse.irrigation_plans.get(j)
-                    self.simulate_specific_plan(greenhouse.name, plan.name)
+                for plan in greenhouse.irrigation_plans:
+                    self.simulate_specific_plan(greenhouse.name, plan.name, summary_only=True)
             
             return True
         except Exception as e:
@@ -194,67 +561,49 @@ class CompleteIrrigationService:
             return False
     
     def generate_xml_output(self, output_path="salida.xml"):
-        """Generar XML usando solo TDAs"""
+        """Generar XML de salida escribiéndolo a medida que se recorre (sin armarlo en memoria)"""
         if not self.current_configuration or not self.simulation_results.has_results():
             return False
         
+        writer = None
         try:
-            # Generar XML manualmente sin usar dict
-            xml_content = '<?xml version="1.0"?>\n<datosSalida>\n  <listaInvernaderos>\n'
+            writer = XMLOutputWriter(output_path)
             
-            for i in range(self.current_configuration.greenhouses.get_size()):
-                greenhouse = self.current_configuration.greenhouses.get(i)
-                xml_content += f'    <invernadero nombre="{greenhouse.name}">\n'
-                xml_content += '      <listaPlanes>\n'
+            # Resúmenes: basta con los nombres, no hace falta cargar invernaderos sin resultados
+            for summary in self.current_configuration.get_greenhouse_summaries():
+                writer.start_greenhouse(summary.name)
                 
-                for j in range(greenhouse.irrigation_plans.get_size()):
-                    plan = greenhouse.irrigation_plans.get(j)
-                    result = self.simulation_results.get_result(greenhouse.name, plan.name)
+                for plan_name, _ in summary.plans:
+                    result = self.simulation_results.get_result(summary.name, plan_name)
                     
                     if result:
-                        xml_content += self._generate_plan_xml(plan, result)
+                        writer.write_plan(plan_name, result)
                 
-                xml_content += '      </listaPlanes>\n    </invernadero>\n'
-            
-            xml_content += '  </listaInvernaderos>\n</datosSalida>'
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(xml_content)
+                writer.end_greenhouse()
             
+            writer.close()
             return True
         except Exception as e:
+            if writer is not None:
+                writer.abort()
             print(f"Error generando XML: {e}")
             return False
     
-    def _generate_plan_xml(self, plan, result):
-        """Generar XML para un plan específico"""
-        xml = f'        <plan nombre="{plan.name}">\n'
-        xml += f'          <tiempoOptimoSegundos> {result.total_time} </tiempoOptimoSegundos>\n'
-        xml += f'          <aguaRequeridaLitros> {int(result.total_water)} </aguaRequeridaLitros>\n'
-        xml += f'          <fertilizanteRequeridoGramos> {int(result.total_fertilizer)} </fertilizanteRequeridoGramos>\n'
-        
-        # Eficiencia de drones
-        xml += '          <eficienciaDronesRegadores>\n'
-        for i in range(result.drone_statistics.get_size()):
-            stat = result.drone_statistics.get(i)
-            xml += f'            <dron nombre="{stat.drone_name}" litrosAgua="{int(stat.water_used)}" gramosFertilizante="{int(stat.fertilizer_used)}"/>\n'
-        xml += '          </eficienciaDronesRegadores>\n'
-        
-        # Instrucciones
-        xml += '          <instrucciones>\n'
-        max_seconds = result.timeline.get_max_seconds()
-        
-        for second in range(1, max_seconds + 1):
-            actions = result.timeline.get_actions_at_second(second)
-            if not actions.is_empty():
-                xml += f'            <tiempo segundos="{second}">\n'
-                for k in range(actions.get_size()):
-                    action = actions.get(k)
-                    xml += f'              <dron nombre="{action.drone_name}" accion="{action.description}"/>\n'
-                xml += '            </tiempo>\n'
-        
-        xml += '          </instrucciones>\n        </plan>\n'
-        return xml
+    def get_plan_fingerprint(self, greenhouse, plan):
+        """Huella del plan; la del invernadero se calcula una vez por configuración"""
+        return plan_fingerprint(self._get_greenhouse_hash(greenhouse), plan, self.simulation_mode)
+    
+    def _get_greenhouse_hash(self, greenhouse):
+        with self._hashes_lock:
+            greenhouse_hash = self._greenhouse_hashes.get(greenhouse)
+            if greenhouse_hash is None:
+                greenhouse_hash = greenhouse_fingerprint(greenhouse)
+                self._greenhouse_hashes.put(greenhouse, greenhouse_hash)
+        return greenhouse_hash
+    
+    def get_cache_stats(self):
+        """Aciertos, fallos y tamaño del caché de resultados"""
+        return self.result_cache.get_stats()
     
     def get_simulation_result(self, greenhouse_name, plan_name):
         """Obtener resultado específico"""
@@ -279,8 +628,7 @@ class CompleteIrrigationService:
         count = 0
         
         all_results = self.simulation_results.get_all_results()
-        for i in range(all_results.get_size()):
-            pair = all_results.get(i)
+        for pair in all_results:
             result = pair.value
             total_time += result.total_time
             total_water += result.total_water
@@ -0,0 +1,172 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from data_structures.simple_list import SimpleList
+from data_structures.hash_map import HashMap
+from models.drone import Drone
+from models.plant import Plant
+from models.greenhouse import Greenhouse
+from models.irrigation_plan import IrrigationPlan
+from services.event_simulator import EventDrivenSimulator, timeline_builder
+from services.simulator import SimulationResult, DroneStatistics, SEQUENTIAL_MODE
+
+def describe_greenhouse(greenhouse, plans=None):
+    """
+    Descripción compacta (solo tuplas y números) de un invernadero y sus
+    planes, para enviarla a otro proceso sin serializar los modelos.
+    Con plans se incluyen solo esos planes.
+    """
+    plants = tuple(
+        (plant.row, plant.position, plant.water_liters, plant.fertilizer_grams)
+        for plant in greenhouse.plants
+    )
+    drones = tuple(
+        (drone.id, drone.name, row)
+        for drone, row in zip(greenhouse.drones, greenhouse.drone_rows)
+    )
+    plans = tuple(
+        (plan.name, plan.plan_string)
+        for plan in (greenhouse.irrigation_plans if plans is None else plans)
+    )
+    return (greenhouse.name, greenhouse.num_rows, greenhouse.plants_per_row, plants, drones, plans)
+
+def build_greenhouse(description):
+    """Reconstruir el invernadero a partir de describe_greenhouse()"""
+    name, num_rows, plants_per_row, plants, drones, plans = description
+
+    greenhouse = Greenhouse(name, num_rows, plants_per_row)
+    for row, position, water_liters, fertilizer_grams in plants:
+        greenhouse.add_plant(Plant(row, position, water_liters, fertilizer_grams, ""))
+    for drone_id, drone_name, assigned_row in drones:
+        greenhouse.add_drone(Drone(drone_id, drone_name), assigned_row)
+    for plan_name, plan_string in plans:
+        greenhouse.add_irrigation_plan(IrrigationPlan(plan_name, plan_string))
+    return greenhouse
+
+# Estado de cada proceso del pool (lo fija _init_worker al arrancar)
+_worker_descriptions = None  # Descripciones de los invernaderos, enviadas una sola vez
+_worker_greenhouses = None  # índice -> Greenhouse ya armado en este proceso
+_worker_mode = SEQUENTIAL_MODE
+
+def _init_worker(descriptions, mode):
+    global _worker_descriptions, _worker_greenhouses, _worker_mode
+    _worker_descriptions = descriptions
+    _worker_greenhouses = HashMap()
+    _worker_mode = mode
+
+def _simulate_plans(task):
+    """
+    Trabajo de un proceso: simular un tramo de planes de un invernadero.
+    Retorna (índice del invernadero, tupla de (nombre_plan, resumen, error));
+    si un plan falla, resumen es None y error el mensaje, para reportarlo en
+    el proceso principal.
+    """
+    greenhouse_index, plans = task
+    greenhouse = _worker_greenhouses.get(greenhouse_index)
+    if greenhouse is None:
+        greenhouse = build_greenhouse(_worker_descriptions[greenhouse_index])
+        _worker_greenhouses.put(greenhouse_index, greenhouse)
+    simulator = EventDrivenSimulator(greenhouse, _worker_mode)
+
+    outcomes = []
+    for plan_name, plan_string in plans:
+        try:
+            result = simulator.simulate_summary(IrrigationPlan(plan_name, plan_string))
+        except Exception as e:
+            outcomes.append((plan_name, None, str(e)))
+            continue
+
+        drone_stats = tuple(
+            (stat.drone_name, stat.water_used, stat.fertilizer_used, stat.plants_irrigated)
+            for stat in result.drone_statistics
+        )
+        outcomes.append((plan_name, (
+            result.total_time, result.total_water, result.total_fertilizer, drone_stats,
+            result.irrigation_times, result.cumulative_stats, tuple(result.checkpoints)
+        ), None))
+    return greenhouse_index, tuple(outcomes)
+
+class ParallelPlanExecutor:
+    """
+    Simula los planes de muchos invernaderos en un pool de procesos.
+    Cada tarea es un tramo de hasta chunk_size planes de un mismo
+    invernadero, así que un archivo con pocos invernaderos y planes largos
+    también se reparte. Los invernaderos se envían una vez a cada proceso
+    (al crear el pool) y cada proceso arma cada uno la primera vez que lo usa.
+    """
+
+    def __init__(self, workers=None, chunk_size=1, mode=SEQUENTIAL_MODE):
+        self.workers = workers  # None: tantos procesos como núcleos
+        self.chunk_size = max(1, chunk_size)  # Planes por tarea
+        self.mode = mode
+
+    def simulate_configuration(self, configuration, storage, result_cache=None, fingerprint=None):
+        """
+        Simular todos los planes y guardar los resúmenes en storage.
+        Con result_cache y fingerprint(greenhouse, plan) solo se envían los
+        planes que no están en el caché. Retorna SimpleList de
+        (invernadero, plan, mensaje) de los planes que no se pudieron simular.
+        """
+        errors = SimpleList()
+        greenhouses = SimpleList()  # Invernaderos con planes pendientes, por índice de tarea
+        descriptions = []
+        tasks = []
+        for greenhouse in configuration.greenhouses:
+            pending = []
+            for plan in greenhouse.irrigation_plans:
+                cached = None
+                if result_cache:
+                    builder = timeline_builder(greenhouse, plan, self.mode)
+                    cached = result_cache.get(fingerprint(greenhouse, plan), builder)
+                if cached is not None:
+                    storage.add_result(greenhouse.name, plan.name, cached)
+                else:
+                    pending.append((plan.name, plan.plan_string))
+            if not pending:
+                continue
+
+            greenhouse_index = greenhouses.get_size()
+            greenhouses.add(greenhouse)
+            descriptions.append(describe_greenhouse(greenhouse, ()))
+            for start in range(0, len(pending), self.chunk_size):
+                tasks.append((greenhouse_index, tuple(pending[start:start + self.chunk_size])))
+        if not tasks:
+            return errors
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(tuple(descriptions), self.mode)) as executor:
+            for greenhouse_index, outcomes in executor.map(_simulate_plans, tasks):
+                greenhouse = greenhouses.get(greenhouse_index)
+                for plan_name, summary, error in outcomes:
+                    if summary is None:
+                        errors.add((greenhouse.name, plan_name, error))
+                        continue
+                    plan = greenhouse.get_plan_by_name(plan_name)
+                    result = self._build_result(greenhouse, plan, summary)
+                    storage.add_result(greenhouse.name, plan_name, result)
+                    if result_cache:
+                        result_cache.put(fingerprint(greenhouse, plan), result)
+        return errors
+
+    def _build_result(self, greenhouse, plan, summary):
+        """Resultado local con el resumen del proceso; el timeline se calcula al pedirlo"""
+        total_time, total_water, total_fertilizer, drone_stats, irrigation_times, cumulative_stats, checkpoints = summary
+
+        result = SimulationResult(timeline_builder(greenhouse, plan, self.mode))
+        result.total_time = total_time
+        result.total_water = total_water
+        result.total_fertilizer = total_fertilizer
+        result.drone_statistics = SimpleList()
+        for drone_name, water_used, fertilizer_used, plants_irrigated in drone_stats:
+            stat = DroneStatistics(drone_name)
+            stat.water_used = water_used
+            stat.fertilizer_used = fertilizer_used
+            stat.plants_irrigated = plants_irrigated
+            result.drone_statistics.add(stat)
+        # Datos para consultar estados y re-simular desde puntos de control
+        result.plan_tasks = plan.tasks
+        result.simulation_mode = self.mode
+        result.irrigation_times = irrigation_times
+        result.cumulative_stats = cumulative_stats
+        for checkpoint in checkpoints:
+            result.checkpoints.add(checkpoint)
+        return result
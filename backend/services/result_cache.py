@@ -0,0 +1,70 @@
+import hashlib
+import threading
+
+from data_structures.lru_cache import LRUCache
+
+def greenhouse_fingerprint(greenhouse):
+    """
+    Huella SHA-256 de lo que afecta la simulación de un invernadero:
+    dimensiones, plantas (recursos) y asignación de drones a hileras.
+    El nombre del invernadero no participa.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{greenhouse.num_rows},{greenhouse.plants_per_row}|".encode())
+    for plant in greenhouse.plants:
+        digest.update(f"{plant.row},{plant.position},{plant.water_liters!r},{plant.fertilizer_grams!r};".encode())
+    digest.update(b"|")
+    for drone, row in zip(greenhouse.drones, greenhouse.drone_rows):
+        digest.update(f"{drone.name},{row};".encode())
+    return digest.hexdigest()
+
+def plan_fingerprint(greenhouse_hash, plan, mode):
+    """Huella de un plan sobre un invernadero en un modo de simulación"""
+    digest = hashlib.sha256()
+    digest.update(f"{greenhouse_hash}|{mode}|{plan.tasks.get_size()}|".encode())
+    # Tareas empacadas: se hashean los bytes de los arreglos
+    digest.update(plan.tasks.rows.tobytes())
+    digest.update(plan.tasks.positions.tobytes())
+    return digest.hexdigest()
+
+class SimulationResultCache:
+    """
+    Resultados de simulación por huella de contenido, con descarte LRU.
+    Seguro para usar desde varios hilos (get también reordena la lista).
+
+    Se guardan copias separadas del invernadero (SimulationResult.detach):
+    el caché sobrevive a las recargas y no debe retener configuraciones
+    viejas. get recibe el constructor del timeline del invernadero actual.
+    """
+
+    DEFAULT_CAPACITY = 256
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.entries = LRUCache(capacity)
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint, timeline_builder):
+        """Copia del resultado guardado que genera su timeline con timeline_builder, o None"""
+        with self._lock:
+            cached = self.entries.get(fingerprint)
+        return cached.attach(timeline_builder) if cached is not None else None
+
+    def put(self, fingerprint, result):
+        detached = result.detach()
+        with self._lock:
+            self.entries.put(fingerprint, detached)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def get_stats(self):
+        """Contadores del caché para monitoreo"""
+        with self._lock:
+            return {
+                'size': self.entries.get_size(),
+                'capacity': self.entries.capacity,
+                'hits': self.entries.hits,
+                'misses': self.entries.misses,
+                'evictions': self.entries.evictions
+            }
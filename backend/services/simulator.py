@@ -1,20 +1,90 @@
+import copy
+from array import array
 
-from data_structures.list_of_lists import ListOfLists
+from data_structures.columnar_timeline import ColumnarTimeline, action_code, describe_action
 from data_structures.simple_list import SimpleList
+from data_structures.cumulative_stats import CumulativeStats
+
+# Modos de simulación
+SEQUENTIAL_MODE = "sequential"  # Solo se mueve el dron de la tarea actual
+CONCURRENT_MODE = "concurrent"  # Los demás drones se adelantan a su próxima tarea
+
+SIMULATION_MODES = (SEQUENTIAL_MODE, CONCURRENT_MODE)
+
+def validate_simulation_mode(mode):
+    if mode not in SIMULATION_MODES:
+        raise ValueError(f"Modo de simulación desconocido: {mode}")
+    return mode
 
 class DroneAction:
-    def __init__(self, drone_name, action_type, description):
+    def __init__(self, drone_name, action_type, row=None, position=None):
         self.drone_name = drone_name
         self.action_type = action_type  # 'move_forward', 'move_backward', 'irrigate', 'wait', 'finish'
-        self.description = description  # 'Adelante (H1P2)', 'Regar', 'Esperar', etc.
+        self.row = row
+        self.position = position  # Posición destino del movimiento o posición regada
+    
+    @property
+    def description(self):
+        """'Adelante (H1P2)', 'Regar', 'Esperar', etc. (se genera solo al pedirla)"""
+        return describe_action(action_code(self.action_type), self.row, self.position)
 
 class SimulationResult:
-    def __init__(self):
-        self.timeline = ListOfLists()
+    def __init__(self, timeline_builder=None):
+        # Con timeline_builder el timeline se genera solo cuando se pide
+        self._timeline = None if timeline_builder else ColumnarTimeline()
+        self._timeline_builder = timeline_builder
         self.total_time = 0
         self.total_water = 0
         self.total_fertilizer = 0
         self.drone_statistics = SimpleList()  # Lista de estadísticas por dron
+        # Para re-simular desde puntos de control (simulador por eventos)
+        self.checkpoints = SimpleList()
+        self.plan_tasks = None
+        self.simulation_mode = None
+        # Segundo de riego de cada tarea (creciente), para consultar el estado en t
+        self.irrigation_times = None
+        # Sumas prefijas por dron para recursos hasta t o entre t1 y t2
+        self.cumulative_stats = None
+        self.state_index = None  # SimulationStateIndex, se crea en la primera consulta
+    
+    @property
+    def timeline(self):
+        if self._timeline is None:
+            self._timeline = self._timeline_builder()
+            self._timeline_builder = None
+        return self._timeline
+    
+    @timeline.setter
+    def timeline(self, timeline):
+        self._timeline = timeline
+        self._timeline_builder = None
+    
+    def has_timeline(self):
+        """True si el timeline ya fue generado"""
+        return self._timeline is not None
+    
+    def detach(self):
+        """
+        Copia para guardar en un caché: sin el constructor del timeline ni el
+        índice de estados, que mantendrían vivo el invernadero que la simuló.
+        """
+        detached = copy.copy(self)
+        detached._timeline_builder = None
+        detached.state_index = None
+        return detached
+    
+    def attach(self, timeline_builder):
+        """Copia de un resultado separado (detach) que genera su timeline con timeline_builder"""
+        attached = copy.copy(self)
+        if attached._timeline is None:
+            attached._timeline_builder = timeline_builder
+        return attached
+    
+    def peek_timeline(self):
+        """Timeline para una sola lectura: el ya generado, o uno temporal que no se guarda"""
+        if self._timeline is not None:
+            return self._timeline
+        return self._timeline_builder()
 
 class DroneStatistics:
     def __init__(self, drone_name):
@@ -23,187 +93,187 @@ class DroneStatistics:
         self.fertilizer_used = 0
         self.plants_irrigated = 0
 
+class SimulationRun:
+    """
+    Estado propio de una corrida: segundo actual, posición de cada dron y
+    avance del plan. Los Drone de la configuración no se modifican, así que
+    varias simulaciones pueden correr a la vez (hilos) sobre el mismo
+    invernadero.
+    """
+    __slots__ = ("current_time", "positions", "plan")
+
+    def __init__(self, drone_count, irrigation_plan):
+        self.current_time = 0
+        self.positions = array('I', [0]) * drone_count  # Todos empiezan en 0
+        self.plan = irrigation_plan.start_run()
+
 class DiscreteSimulator:
-    def __init__(self, greenhouse):
+    def __init__(self, greenhouse, mode=SEQUENTIAL_MODE):
         self.greenhouse = greenhouse
-        self.current_time = 0
-        self.simulation_finished = False
+        self.mode = validate_simulation_mode(mode)
+        self.compiled = greenhouse.get_compiled()
     
     def simulate_plan(self, irrigation_plan):
         """Ejecutar simulación completa del plan de riego"""
-        # Reiniciar estado
-        self._reset_simulation()
-        
         # Crear resultado
         result = SimulationResult()
+        for drone_index, drone_name in enumerate(self.compiled.drone_names):
+            result.timeline.register_drone(drone_name, self.compiled.drone_rows[drone_index])
+        
+        # Guardar en el timeline lo que produce la simulación paso a paso
+        for second, actions in self.iter_plan(irrigation_plan, result):
+            for drone_index, action in enumerate(actions):
+                result.timeline.add_action(
+                    second, drone_index,
+                    action_code(action.action_type), action.position or 0
+                )
+        
+        return result
+    
+    def iter_plan(self, irrigation_plan, result=None):
+        """
+        Simular segundo a segundo produciendo (segundo, acciones) sin guardar
+        nada, para recorrer planes muy largos con memoria constante.
+        Si se pasa result, al terminar se llenan sus totales y estadísticas.
+        """
+        irrigation_plan.check_syntax()
+        # Estado de esta corrida (el simulador no guarda estado entre corridas)
+        run = SimulationRun(self.compiled.drone_count, irrigation_plan)
         
         # Inicializar estadísticas de drones
         drone_stats = self._initialize_drone_statistics()
         
-        # Clonar el plan para no modificar el original
-        current_plan = self._clone_irrigation_plan(irrigation_plan)
+        irrigation_times = array('I')
+        cumulative_stats = CumulativeStats()
+        for drone_name in self.compiled.drone_names:
+            cumulative_stats.register_drone(drone_name)
         
         # Simulación paso a paso
-        while not self._is_simulation_complete(current_plan):
-            self.current_time += 1
+        while not self._is_simulation_complete(run.plan):
+            run.current_time += 1
             
             # Calcular acciones para este segundo
-            actions_this_second = self._calculate_actions_for_second(current_plan, drone_stats)
-            
-            # Guardar acciones en timeline
-            for i in range(actions_this_second.get_size()):
-                action = actions_this_second.get(i)
-                result.timeline.add_action_to_second(self.current_time, action)
+            actions_this_second = self._calculate_actions_for_second(run)
             
             # Ejecutar acciones (actualizar estados)
-            self._execute_actions(actions_this_second, current_plan, drone_stats)
+            completed_before = run.plan.current_index
+            self._execute_actions(actions_this_second, run, drone_stats)
+            if run.plan.current_index != completed_before:
+                irrigation_times.append(run.current_time)
+                self._record_irrigation(cumulative_stats, run.current_time, actions_this_second, drone_stats)
+            
+            yield run.current_time, actions_this_second
         
         # Finalizar resultado
-        result.total_time = self.current_time
-        result.drone_statistics = drone_stats
-        self._calculate_totals(result, drone_stats)
-        
-        return result
-    
-    def _reset_simulation(self):
-        """Reiniciar estado de simulación"""
-        self.current_time = 0
-        self.simulation_finished = False
-        
-        # Resetear posiciones de drones
-        for i in range(self.greenhouse.drones.get_size()):
-            drone = self.greenhouse.drones.get(i)
-            drone.reset_position()
+        if result is not None:
+            result.total_time = run.current_time
+            result.drone_statistics = drone_stats
+            result.plan_tasks = irrigation_plan.tasks
+            result.simulation_mode = self.mode
+            result.irrigation_times = irrigation_times
+            result.cumulative_stats = cumulative_stats
+            self._calculate_totals(result, drone_stats)
     
     def _initialize_drone_statistics(self):
         """Crear estadísticas iniciales para cada dron"""
         stats = SimpleList()
         
-        for i in range(self.greenhouse.drones.get_size()):
-            drone = self.greenhouse.drones.get(i)
-            drone_stat = DroneStatistics(drone.name)
+        for drone_name in self.compiled.drone_names:
+            drone_stat = DroneStatistics(drone_name)
             stats.add(drone_stat)
         
         return stats
     
-    def _clone_irrigation_plan(self, original_plan):
-        """Crear copia del plan para no modificar el original"""
-        # CAMBIAR ESTE IMPORT:
-        from models.irrigation_plan import IrrigationPlan
-        return IrrigationPlan(original_plan.name, original_plan.plan_string)
-    
-    def _calculate_actions_for_second(self, current_plan, drone_stats):
+    def _calculate_actions_for_second(self, run):
         """Calcular qué debe hacer cada dron en este segundo"""
         actions = SimpleList()
         
-        current_task = current_plan.get_next_task()  # H1-P2, H2-P1, etc.
+        current_task = run.plan.get_next_task()  # (1, 2), (2, 1), etc.
+        if current_task is not None and self.compiled.get_drone_index_for_row(current_task[0]) == -1:
+            # Ningún dron la regaría: la simulación no terminaría nunca
+            raise ValueError(f"No hay dron asignado a la hilera {current_task[0]}")
         
-        for i in range(self.greenhouse.drones.get_size()):
-            drone = self.greenhouse.drones.get(i)
-            action = self._decide_drone_action(drone, current_task, current_plan)
+        for drone_index, drone_name in enumerate(self.compiled.drone_names):
+            action = self._decide_drone_action(drone_index, drone_name, current_task, run)
             actions.add(action)
         
         return actions
     
-    def _decide_drone_action(self, drone, current_task, current_plan):
+    def _decide_drone_action(self, drone_index, drone_name, current_task, run):
         """Decidir qué acción debe realizar un dron específico"""
         
         # Si no hay más tareas, terminar
         if current_task is None:
-            return DroneAction(drone.name, "finish", "FIN")
+            return DroneAction(drone_name, "finish")
         
-        # Parsear tarea actual (H1-P2 -> row=1, position=2)
-        target_row, target_position = self._parse_task(current_task)
+        row = self.compiled.drone_rows[drone_index]
+        position = run.positions[drone_index]
+        
+        # Tarea actual ya compilada (H1-P2 -> row=1, position=2)
+        target_row, target_position = current_task
         
         # ¿Es tarea para este dron?
-        if target_row != drone.assigned_row:
+        if target_row != row:
+            if self.mode == CONCURRENT_MODE:
+                # Adelantarse hacia su próxima tarea sin regar todavía
+                next_task = run.plan.get_next_task_for_row(row)
+                if next_task is not None and position != next_task[1]:
+                    return self._move_towards(drone_name, row, position, next_task[1])
             # No es su turno, esperar
-            return DroneAction(drone.name, "wait", "Esperar")
+            return DroneAction(drone_name, "wait")
         
         # ¿Está en la posición correcta?
-        if drone.current_position == target_position:
+        if position == target_position:
             # Puede regar
-            return DroneAction(drone.name, "irrigate", "Regar")
+            return DroneAction(drone_name, "irrigate", row, target_position)
         
         # Necesita moverse
-        if drone.current_position < target_position:
+        return self._move_towards(drone_name, row, position, target_position)
+    
+    def _move_towards(self, drone_name, row, position, target_position):
+        """Acción de avanzar o retroceder un paso hacia la posición destino"""
+        if position < target_position:
             # Moverse adelante
-            next_pos = drone.current_position + 1
-            description = f"Adelante (H{drone.assigned_row}P{next_pos})"
-            return DroneAction(drone.name, "move_forward", description)
+            return DroneAction(drone_name, "move_forward", row, position + 1)
         else:
             # Moverse atrás
-            next_pos = drone.current_position - 1
-            description = f"Atrás (H{drone.assigned_row}P{next_pos})"
-            return DroneAction(drone.name, "move_backward", description)
+            return DroneAction(drone_name, "move_backward", row, position - 1)
     
-    def _parse_task(self, task):
-        """Convertir 'H1-P2' a row=1, position=2"""
-        if not task:
-            return None, None
+    def _execute_actions(self, actions, run, drone_stats):
+        """Ejecutar las acciones calculadas (una por dron, en orden)"""
         
-        # H1-P2 -> ["H1", "P2"]
-        parts = task.split("-")
-        row = int(parts[0][1:])  # H1 -> 1
-        position = int(parts[1][1:])  # P2 -> 2
-        
-        return row, position
-    
-    def _execute_actions(self, actions, current_plan, drone_stats):
-        """Ejecutar las acciones calculadas"""
-        
-        for i in range(actions.get_size()):
-            action = actions.get(i)
-            drone = self._get_drone_by_name(action.drone_name)
-            
-            if action.action_type == "move_forward":
-                drone.move_forward()
-            
-            elif action.action_type == "move_backward":
-                drone.move_backward()
+        for drone_index, action in enumerate(actions):
+            if action.action_type == "move_forward" or action.action_type == "move_backward":
+                run.positions[drone_index] = action.position
             
             elif action.action_type == "irrigate":
-                drone.irrigate()
                 # Actualizar estadísticas
-                self._update_drone_statistics(drone, drone_stats)
+                self._update_drone_statistics(drone_stats.get(drone_index), action.row, action.position)
                 # Completar tarea actual
-                current_plan.complete_current_task()
-            
-            elif action.action_type == "wait":
-                drone.wait()
-            
-            elif action.action_type == "finish":
-                drone.finish()
-    
-    def _get_drone_by_name(self, drone_name):
-        """Buscar dron por nombre"""
-        for i in range(self.greenhouse.drones.get_size()):
-            drone = self.greenhouse.drones.get(i)
-            if drone.name == drone_name:
-                return drone
-        return None
-    
-    def _update_drone_statistics(self, drone, drone_stats):
-        """Actualizar estadísticas cuando un dron riega"""
-        # Buscar estadísticas del dron
-        for i in range(drone_stats.get_size()):
-            stat = drone_stats.get(i)
-            if stat.drone_name == drone.name:
-                # Obtener planta regada
-                plant = self.greenhouse.get_plant_at(drone.assigned_row, drone.current_position)
-                if plant:
-                    stat.water_used += plant.water_liters
-                    stat.fertilizer_used += plant.fertilizer_grams
-                    stat.plants_irrigated += 1
-                break
+                run.plan.complete_current_task()
+    
+    def _update_drone_statistics(self, stat, row, position):
+        """Sumar los recursos de la planta regada"""
+        cell = self.compiled.get_plant_cell(row, position)
+        if cell != -1:
+            stat.water_used += self.compiled.water[cell]
+            stat.fertilizer_used += self.compiled.fertilizer[cell]
+            stat.plants_irrigated += 1
+    
+    def _record_irrigation(self, cumulative_stats, second, actions, drone_stats):
+        """Guardar los totales acumulados del dron que regó en este segundo"""
+        for drone_index, action in enumerate(actions):
+            if action.action_type == "irrigate":
+                stat = drone_stats.get(drone_index)
+                cumulative_stats.record(drone_index, second, action.position,
+                                        stat.water_used, stat.fertilizer_used, stat.plants_irrigated)
     
     def _calculate_totals(self, result, drone_stats):
         """Calcular totales de agua y fertilizante"""
         total_water = 0
         total_fertilizer = 0
         
-        for i in range(drone_stats.get_size()):
-            stat = drone_stats.get(i)
+        for stat in drone_stats:
             total_water += stat.water_used
             total_fertilizer += stat.fertilizer_used
         
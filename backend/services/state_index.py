@@ -0,0 +1,122 @@
+from data_structures.simple_list import SimpleList
+from services.simulator import CONCURRENT_MODE
+
+class DroneState:
+    """Posición y recursos acumulados de un dron al final de un segundo"""
+    __slots__ = ("drone_name", "row", "position", "water_used", "fertilizer_used", "plants_irrigated")
+
+    def __init__(self, drone_name, row, position, water_used, fertilizer_used, plants_irrigated):
+        self.drone_name = drone_name
+        self.row = row
+        self.position = position
+        self.water_used = water_used
+        self.fertilizer_used = fertilizer_used
+        self.plants_irrigated = plants_irrigated
+
+class SimulationState:
+    """Estado de una simulación al final del segundo 'second'"""
+
+    def __init__(self, second, completed_tasks, total_tasks):
+        self.second = second
+        self.completed_tasks = completed_tasks
+        self.remaining_count = total_tasks - completed_tasks
+        self.remaining_tasks = SimpleList()  # Primeras tareas pendientes (hilera, posición)
+        self.drones = SimpleList()  # DroneState en el orden del invernadero
+
+    def get_drone_state(self, drone_name):
+        for drone_state in self.drones:
+            if drone_state.drone_name == drone_name:
+                return drone_state
+        return None
+
+class SimulationStateIndex:
+    """
+    Consultas de estado en cualquier segundo t sobre un resultado simulado.
+
+    Los riegos ocurren en segundos crecientes: las tareas terminadas hasta t
+    salen de una búsqueda binaria en irrigation_times. Los recursos de cada
+    dron salen de sus sumas prefijas (CumulativeStats). Las posiciones se
+    calculan en forma cerrada a partir del riego anterior y el siguiente de
+    cada dron, sin generar el timeline. Costo O(log n + drones + tareas de
+    cola pedidas).
+    """
+
+    DEFAULT_QUEUE_LIMIT = 10
+
+    def __init__(self, greenhouse, result):
+        if result.irrigation_times is None or result.plan_tasks is None or result.cumulative_stats is None:
+            raise ValueError("El resultado no tiene datos para consultar estados")
+        self.greenhouse = greenhouse
+        self.result = result
+        self.tasks = result.plan_tasks
+        self.irrigation_times = result.irrigation_times
+        self.cumulative_stats = result.cumulative_stats
+
+        self.compiled = greenhouse.get_compiled()
+        self.drone_rows = self.compiled.drone_rows
+        self.concurrent = result.simulation_mode == CONCURRENT_MODE
+
+    def completed_tasks_at(self, second):
+        """Cantidad de tareas regadas hasta el segundo 'second' inclusive"""
+        low = 0
+        high = len(self.irrigation_times)
+        while low < high:
+            middle = (low + high) // 2
+            if self.irrigation_times[middle] <= second:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def stats_until(self, second):
+        """CumulativeTotals de cada dron hasta el segundo 'second'"""
+        return self.cumulative_stats.stats_until(second)
+
+    def stats_between(self, first_second, last_second):
+        """CumulativeTotals de cada dron entre dos segundos (inclusive)"""
+        return self.cumulative_stats.stats_between(first_second, last_second)
+
+    def state_at(self, second, queue_limit=DEFAULT_QUEUE_LIMIT):
+        """Posiciones, cola restante (hasta queue_limit tareas) y recursos en t"""
+        completed = self.completed_tasks_at(second)
+        state = SimulationState(second, completed, self.tasks.get_size())
+
+        # Cola restante: las tareas del plan a partir de la primera sin regar
+        last = min(completed + queue_limit, self.tasks.get_size())
+        for task_index in range(completed, last):
+            state.remaining_tasks.add(self.tasks.peek_at(task_index))
+
+        # Secuencial: solo se mueve el dron de la primera tarea pendiente
+        moving_drone = -1
+        if not self.concurrent and completed < self.tasks.get_size():
+            moving_drone = self.compiled.get_drone_index_for_row(self.tasks.peek_at(completed)[0])
+
+        for drone_index, totals in enumerate(self.stats_until(second)):
+            position = totals.last_position
+            if self.concurrent or drone_index == moving_drone:
+                position = self._position_at(drone_index, second, completed, position)
+            state.drones.add(DroneState(
+                totals.drone_name, self.drone_rows[drone_index], position,
+                totals.water_used, totals.fertilizer_used, totals.plants_irrigated
+            ))
+        return state
+
+    def _position_at(self, drone_index, second, completed, last_position):
+        """
+        Posición de un dron que puede estar en camino a su próximo riego:
+        sale un segundo después de su riego anterior (concurrente) o del
+        riego anterior del plan (secuencial) y avanza un paso por segundo.
+        """
+        cumulative = self.cumulative_stats.drones.get(drone_index)
+        count = cumulative.count_until(second)
+        if count >= cumulative.get_size():
+            return last_position  # Ya no tiene riegos pendientes
+        target = cumulative.positions[count]
+
+        if self.concurrent:
+            move_start = (cumulative.seconds[count - 1] if count else 0) + 1
+        else:
+            move_start = (self.irrigation_times[completed - 1] if completed else 0) + 1
+
+        steps = min(max(0, second - move_start + 1), abs(target - last_position))
+        return last_position + steps if target > last_position else last_position - steps
@@ -0,0 +1,323 @@
+# test_equivalencias.py - Los caminos rápidos dan lo mismo que los de referencia
+# (se corre con pytest o directamente: python test_equivalencias.py)
+import sys
+import os
+import random
+import tempfile
+
+# Agregar el directorio backend al path para imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.irrigation_plan import (
+    IrrigationPlan, PlanError, MAX_REPORTED_ISSUES, _compile_plan, _scan_plan, format_task
+)
+from services.event_simulator import EventDrivenSimulator
+from services.simulator import DiscreteSimulator, SIMULATION_MODES
+from services.main_service import CompleteIrrigationService, SimulationResultsStorage
+from services.parallel_simulator import ParallelPlanExecutor
+from services.batch_simulator import BatchPlanSimulator, is_batch_available
+from services.config_cache import ConfigurationCache
+from utils.xml_stream_parser import StreamingXMLParser
+from utils.parallel_xml_parser import ParallelXMLParser
+from utils.lazy_xml_parser import LazyXMLParser
+
+SEED = 2023
+
+# XML de ejemplo del repositorio
+UPLOADS_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend", "uploads")
+SAMPLE_FILES = (os.path.join(UPLOADS_DIRECTORY, "entrada.xml"), os.path.join(UPLOADS_DIRECTORY, "entrada_test.xml"))
+
+def random_plan_string(rnd, num_rows, plants_per_row, task_count):
+    """Plan válido con separadores variados ('H1-P2, h3-p1,\\nH2-P2')"""
+    tasks = [
+        f"{rnd.choice('Hh')}{rnd.randint(1, num_rows)}-{rnd.choice('Pp')}{rnd.randint(1, plants_per_row)}"
+        for _ in range(task_count)
+    ]
+    return rnd.choice([", ", ",", " ,\n", ",\t"]).join(tasks)
+
+def random_configuration_xml(rnd, greenhouse_count):
+    """XML de entrada con invernaderos, plantas, drones y planes al azar"""
+    drones = []
+    greenhouses = []
+    for greenhouse_index in range(greenhouse_count):
+        num_rows = rnd.randint(1, 5)
+        plants_per_row = rnd.randint(1, 12)
+        lines = [f'<invernadero nombre="Invernadero {greenhouse_index}">',
+                 f'<numeroHileras>{num_rows}</numeroHileras>',
+                 f'<plantasXhilera>{plants_per_row}</plantasXhilera>',
+                 '<listaPlantas>']
+        for row in range(1, num_rows + 1):
+            for position in range(1, plants_per_row + 1):
+                lines.append(f'<planta hilera="{row}" posicion="{position}" '
+                             f'litrosAgua="{rnd.randint(1, 9)}" gramosFertilizante="{rnd.randint(1, 300)}">planta</planta>')
+        lines.append('</listaPlantas>')
+        lines.append('<asignacionDrones>')
+        for row in range(1, num_rows + 1):
+            drone_id = len(drones) + 1
+            drones.append(f'<dron id="{drone_id}" nombre="DR{drone_id:02d}"/>')
+            lines.append(f'<dron id="{drone_id}" hilera="{row}"/>')
+        lines.append('</asignacionDrones>')
+        lines.append('<planesRiego>')
+        for plan_index in range(rnd.randint(1, 4)):
+            plan_string = random_plan_string(rnd, num_rows, plants_per_row, rnd.randint(1, 40))
+            lines.append(f'<plan nombre="Dia {plan_index + 1}">{plan_string}</plan>')
+        lines.append('</planesRiego>')
+        lines.append('</invernadero>')
+        greenhouses.append("\n".join(lines))
+    return ('<?xml version="1.0"?>\n<configuracion>\n<listaDrones>\n' + "\n".join(drones)
+            + '\n</listaDrones>\n<listaInvernaderos>\n' + "\n".join(greenhouses)
+            + '\n</listaInvernaderos>\n</configuracion>')
+
+def load_random_configuration(rnd, greenhouse_count=3):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "entrada.xml")
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(random_configuration_xml(rnd, greenhouse_count))
+        return StreamingXMLParser().parse_configuration_file(path)
+
+def describe_result(result):
+    """Totales, estadísticas por dron y acciones de cada segundo, para comparar"""
+    timeline = result.timeline
+    seconds = []
+    for second in range(1, timeline.get_max_seconds() + 1):
+        seconds.append([(action.drone_name, action.description)
+                        for action in timeline.get_actions_at_second(second)])
+    stats = [(stat.drone_name, stat.water_used, stat.fertilizer_used, stat.plants_irrigated)
+             for stat in result.drone_statistics]
+    return (result.total_time, result.total_water, result.total_fertilizer, stats,
+            list(result.irrigation_times), seconds)
+
+def describe_configuration(configuration):
+    """Drones, invernaderos, plantas, asignaciones y planes, para comparar parsers"""
+    drones = [(drone.id, drone.name) for drone in configuration.all_drones]
+    greenhouses = []
+    for greenhouse in configuration.greenhouses:
+        plants = [(plant.row, plant.position, plant.water_liters, plant.fertilizer_grams, plant.plant_type)
+                  for plant in greenhouse.plants]
+        assignments = [(drone.id, drone.name, row) for drone, row in zip(greenhouse.drones, greenhouse.drone_rows)]
+        plans = [(plan.name, plan.plan_string, list(plan.tasks.rows), list(plan.tasks.positions))
+                 for plan in greenhouse.irrigation_plans]
+        greenhouses.append((greenhouse.name, greenhouse.num_rows, greenhouse.plants_per_row,
+                            plants, assignments, plans))
+    return drones, greenhouses
+
+def test_compiled_plan_matches_scan():
+    """La expresión regular del camino rápido acepta lo mismo que el recorrido token a token"""
+    rnd = random.Random(SEED)
+    alphabet = ["H", "h", "P", "p", "-", ",", " ", "\n", "\t", "0", "1", "2", "9", "x", "²", "07", "4294967296"]
+    for _ in range(20000):
+        if rnd.random() < 0.5:
+            plan_string = random_plan_string(rnd, 12, 12, rnd.randint(0, 6))
+            if plan_string and rnd.random() < 0.3:
+                cut = rnd.randrange(len(plan_string) + 1)
+                plan_string = plan_string[:cut] + rnd.choice(alphabet) + plan_string[cut:]
+        else:
+            plan_string = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 14)))
+
+        tasks, issues, total = _compile_plan(plan_string)
+        scanned_tasks, scanned_issues, scanned_total = _scan_plan(plan_string)
+        assert tasks.equals(scanned_tasks), plan_string
+        assert total == scanned_total, plan_string
+        assert ([(issue.offset, issue.token, issue.message) for issue in issues]
+                == [(issue.offset, issue.token, issue.message) for issue in scanned_issues]), plan_string
+
+def test_check_syntax_reports_every_issue():
+    """Un plan mal escrito conserva sus tareas válidas y check_syntax reporta todos los errores"""
+    plan = IrrigationPlan("Dia 1", "H1-P1, HX-P2, H2-P0 ," + ", H3-Q1" * 30 + ", H2-P2")
+    assert list(plan.tasks) == [(1, 1), (2, 2)]
+    assert plan.syntax_error_count == 32
+    assert plan.syntax_issues.get_size() == MAX_REPORTED_ISSUES
+    assert [(issue.offset, issue.token) for issue in list(plan.syntax_issues)[:2]] == [(7, "HX-P2"), (14, "H2-P0")]
+
+    error = None
+    try:
+        plan.check_syntax()
+    except PlanError as e:
+        error = e
+    assert error is not None and error.total == 32
+    assert str(error) == "Plan 'Dia 1': Tarea inválida en el plan: 'HX-P2' (desplazamiento 7) y 31 errores más"
+
+    IrrigationPlan("Dia 2", "H1-P1, h2-p3").check_syntax()  # Sin errores no lanza nada
+
+def test_event_simulator_matches_discrete():
+    """El simulador por eventos produce el mismo resultado que el de segundo a segundo"""
+    rnd = random.Random(SEED)
+    configuration = load_random_configuration(rnd, 4)
+    for mode in SIMULATION_MODES:
+        for greenhouse in configuration.greenhouses:
+            event_simulator = EventDrivenSimulator(greenhouse, mode)
+            discrete_simulator = DiscreteSimulator(greenhouse, mode)
+            for plan in greenhouse.irrigation_plans:
+                expected = describe_result(discrete_simulator.simulate_plan(plan))
+                assert describe_result(event_simulator.simulate_plan(plan)) == expected, (mode, greenhouse.name, plan.name)
+                assert describe_result(event_simulator.simulate_summary(plan)) == expected, (mode, greenhouse.name, plan.name)
+
+def test_batch_simulator_matches_discrete():
+    """Los totales en lote de NumPy coinciden con simular cada plan segundo a segundo"""
+    if not is_batch_available():
+        return  # Sin NumPy no hay simulador en lote que probar
+    rnd = random.Random(SEED)
+    configuration = load_random_configuration(rnd, 4)
+    for mode in SIMULATION_MODES:
+        for greenhouse in configuration.greenhouses:
+            plans = list(greenhouse.irrigation_plans)
+            # Un plan vacío y uno con una hilera sin dron (no se puede simular)
+            plans.append(IrrigationPlan("Vacío", ""))
+            plans.append(IrrigationPlan("Sin dron", f"H1-P1, H{greenhouse.num_rows + 1}-P1"))
+            batch = BatchPlanSimulator(greenhouse, mode).simulate_plans(plans)
+            discrete_simulator = DiscreteSimulator(greenhouse, mode)
+            for plan_index, plan in enumerate(plans):
+                summary = batch.get_summary(plan_index)
+                try:
+                    expected = discrete_simulator.simulate_plan(plan)
+                except ValueError:
+                    assert summary.error is not None, (mode, greenhouse.name, plan.name)
+                    continue
+                assert summary.error is None, (mode, greenhouse.name, plan.name)
+                assert ((summary.total_time, summary.total_water, summary.total_fertilizer)
+                        == (expected.total_time, expected.total_water, expected.total_fertilizer)), (mode, plan.name)
+                for drone_index, stat in enumerate(expected.drone_statistics):
+                    assert batch.water_by_drone[plan_index, drone_index] == stat.water_used
+                    assert batch.fertilizer_by_drone[plan_index, drone_index] == stat.fertilizer_used
+                    assert batch.plants_by_drone[plan_index, drone_index] == stat.plants_irrigated
+
+def test_resimulation_matches_full_simulation():
+    """Re-simular desde un punto de control da lo mismo que simular el plan nuevo completo"""
+    rnd = random.Random(SEED)
+    configuration = load_random_configuration(rnd, 4)
+    for mode in SIMULATION_MODES:
+        for greenhouse in configuration.greenhouses:
+            simulator = EventDrivenSimulator(greenhouse, mode, checkpoint_interval=4)
+            for plan in greenhouse.irrigation_plans:
+                tasks = [format_task(task) for task in plan.tasks]
+                for summary_only in (False, True):
+                    previous = simulator.simulate_summary(plan) if summary_only else simulator.simulate_plan(plan)
+                    # Mismo comienzo y final distinto
+                    cut = rnd.randrange(len(tasks) + 1)
+                    new_tasks = tasks[:cut] + [
+                        f"H{rnd.randint(1, greenhouse.num_rows)}-P{rnd.randint(1, greenhouse.plants_per_row)}"
+                        for _ in range(rnd.randint(0, 20))
+                    ]
+                    new_plan = IrrigationPlan(plan.name, ", ".join(new_tasks))
+
+                    resimulated = simulator.resimulate_plan(previous, new_plan)
+                    expected = simulator.simulate_plan(new_plan)
+                    assert describe_result(resimulated) == describe_result(expected), (mode, greenhouse.name, cut)
+                    assert resimulated.checkpoints.get_size() == expected.checkpoints.get_size()
+
+def test_reload_keeps_only_valid_results():
+    """Después de recargar, cada resultado coincide con simular el XML nuevo desde cero"""
+    rnd = random.Random(SEED)
+    original = random_configuration_xml(rnd, 5)
+
+    # Cambiar el final de un plan, una planta de otro invernadero y quitar el último
+    greenhouses = original.split('<invernadero ')
+    first_plan_end = greenhouses[1].index('</plan>')
+    greenhouses[1] = greenhouses[1][:first_plan_end] + ", H1-P1" + greenhouses[1][first_plan_end:]
+    greenhouses[2] = greenhouses[2].replace('litrosAgua="', 'litrosAgua="1', 1)
+    modified = '<invernadero '.join(greenhouses[:-1]) + '\n</listaInvernaderos>\n</configuracion>'
+
+    for mode in SIMULATION_MODES:
+        with tempfile.TemporaryDirectory() as directory:
+            original_path = os.path.join(directory, "original.xml")
+            modified_path = os.path.join(directory, "modificado.xml")
+            with open(original_path, 'w', encoding='utf-8') as file:
+                file.write(original)
+            with open(modified_path, 'w', encoding='utf-8') as file:
+                file.write(modified)
+
+            service = CompleteIrrigationService(mode, config_cache_dir=None)
+            assert service.reload_configuration_file(original_path).added_greenhouses == 5
+            service.simulate_all_plans()
+            summary = service.reload_configuration_file(modified_path)
+            assert summary.changed_greenhouses == 1
+            assert summary.removed_greenhouses == 1
+            assert summary.resimulated_results >= 1
+
+            configuration = StreamingXMLParser().parse_configuration_file(modified_path)
+            for greenhouse in configuration.greenhouses:
+                simulator = EventDrivenSimulator(greenhouse, mode)
+                for plan in greenhouse.irrigation_plans:
+                    result = service.get_simulation_result(greenhouse.name, plan.name)
+                    assert result is not None, (greenhouse.name, plan.name)
+                    expected = describe_result(simulator.simulate_plan(plan))
+                    assert describe_result(result) == expected, (mode, greenhouse.name, plan.name)
+            assert service.count_total_simulations() == sum(
+                greenhouse.irrigation_plans.get_size() for greenhouse in configuration.greenhouses
+            )
+
+def test_parallel_simulation_matches_sequential():
+    """El pool de procesos guarda los mismos resultados que simular plan por plan"""
+    for path in SAMPLE_FILES:
+        configuration = StreamingXMLParser().parse_configuration_file(path)
+        for mode in SIMULATION_MODES:
+            storage = SimulationResultsStorage()
+            errors = ParallelPlanExecutor(workers=2, chunk_size=1, mode=mode).simulate_configuration(configuration, storage)
+            assert errors.is_empty()
+            for greenhouse in configuration.greenhouses:
+                simulator = EventDrivenSimulator(greenhouse, mode)
+                for plan in greenhouse.irrigation_plans:
+                    expected = describe_result(simulator.simulate_plan(plan))
+                    result = storage.get_result(greenhouse.name, plan.name)
+                    assert describe_result(result) == expected, (path, mode, greenhouse.name, plan.name)
+
+def test_configuration_cache_matches_parser():
+    """La configuración leída del caché en disco es la misma que parsear el XML"""
+    for path in SAMPLE_FILES:
+        expected = describe_configuration(StreamingXMLParser().parse_configuration_file(path))
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ConfigurationCache(directory)
+            assert describe_configuration(cache.load(path, StreamingXMLParser())) == expected, path
+            assert describe_configuration(cache.load(path, StreamingXMLParser())) == expected, path
+            assert cache.get_stats() == {'hits': 1, 'misses': 1}
+
+def test_parallel_parser_matches_sequential():
+    """Parsear con un proceso por invernadero da la misma configuración que iterparse"""
+    with tempfile.TemporaryDirectory() as directory:
+        # Además de los ejemplos, uno con varios invernaderos para que use el pool
+        random_path = os.path.join(directory, "entrada.xml")
+        with open(random_path, 'w', encoding='utf-8') as file:
+            file.write(random_configuration_xml(random.Random(SEED), 5))
+        for path in SAMPLE_FILES + (random_path,):
+            expected = describe_configuration(StreamingXMLParser().parse_configuration_file(path))
+            configuration = ParallelXMLParser(workers=2).parse_configuration_file(path)
+            assert describe_configuration(configuration) == expected, path
+
+def describe_summaries(configuration):
+    return [(summary.name, summary.num_rows, summary.plants_per_row, summary.plant_count,
+             summary.drone_count, list(summary.plans))
+            for summary in configuration.get_greenhouse_summaries()]
+
+def test_lazy_parser_matches_streaming():
+    """El índice perezoso lista lo mismo sin cargar, y al cargar da los mismos invernaderos"""
+    with tempfile.TemporaryDirectory() as directory:
+        random_path = os.path.join(directory, "entrada.xml")
+        with open(random_path, 'w', encoding='utf-8') as file:
+            file.write(random_configuration_xml(random.Random(SEED), 5))
+        for path in SAMPLE_FILES + (random_path,):
+            streaming = StreamingXMLParser().parse_configuration_file(path)
+            lazy = LazyXMLParser().parse_configuration_file(path)
+
+            # El listado sale del índice, sin parsear ningún invernadero
+            assert describe_summaries(lazy) == describe_summaries(streaming), path
+            assert lazy.get_loaded_count() == 0, path
+
+            for greenhouse in streaming.greenhouses:
+                assert lazy.has_greenhouse(greenhouse.name)
+                assert lazy.get_greenhouse_by_name(greenhouse.name).name == greenhouse.name
+            assert describe_configuration(lazy) == describe_configuration(streaming), path
+
+
+if __name__ == "__main__":
+    print("PRUEBAS DE EQUIVALENCIA - GuateRiegos 2.0")
+    print("=" * 50)
+
+    for test in (test_compiled_plan_matches_scan, test_check_syntax_reports_every_issue,
+                 test_event_simulator_matches_discrete, test_batch_simulator_matches_discrete,
+                 test_resimulation_matches_full_simulation, test_reload_keeps_only_valid_results,
+                 test_parallel_simulation_matches_sequential, test_configuration_cache_matches_parser,
+                 test_parallel_parser_matches_sequential, test_lazy_parser_matches_streaming):
+        test()
+        print(f" {test.__name__}: OK")
+
+    print("\n Fin de las pruebas")
@@ -5,6 +5,7 @@ import os
 # Agregar paths
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'data_structures'))
 from data_structures.simple_list import SimpleList
+from models.irrigation_plan import format_task
 
 class DroneStatInfo:
     """Info de estadísticas de dron para gráfico"""
@@ -13,16 +14,17 @@ class DroneStatInfo:
         self.water = 0
         self.fertilizer = 0
         self.plants = 0
+        self.position = "-"
 
 class GraphvizTDAGenerator:
     def __init__(self):
         pass
     
-    def generate_tda_graph(self, simulation_result, time_t, output_path="tda_graph.dot"):
-        """Generar gráfico usando solo TDAs"""
+    def generate_tda_graph(self, simulation_result, time_t, output_path="tda_graph.dot", state=None):
+        """Generar gráfico usando solo TDAs; state es el SimulationState en time_t"""
         
         # Crear contenido DOT
-        dot_content = self._create_dot_content(simulation_result, time_t)
+        dot_content = self._create_dot_content(simulation_result, time_t, state)
         
         # Escribir archivo .dot
         with open(output_path, 'w', encoding='utf-8') as f:
@@ -37,7 +39,7 @@ class GraphvizTDAGenerator:
         except:
             return None, output_path
     
-    def _create_dot_content(self, simulation_result, time_t):
+    def _create_dot_content(self, simulation_result, time_t, state=None):
         """Crear contenido DOT usando TDAs"""
         
         # Obtener acciones en tiempo t
@@ -62,8 +64,7 @@ class GraphvizTDAGenerator:
         
         # Agregar nodos de acciones usando TDAs
         if not actions_at_t.is_empty():
-            for i in range(actions_at_t.get_size()):
-                action = actions_at_t.get(i)
+            for i, action in enumerate(actions_at_t):
                 color = self._get_node_color(action.action_type)
                 
                 dot += f'    action{i} [label="{action.drone_name}\\n{action.description}", fillcolor="{color}"];\n'
@@ -79,10 +80,9 @@ class GraphvizTDAGenerator:
         dot += '        style=dashed;\n'
         dot += '        color=blue;\n'
         
-        # Estimar tareas restantes usando TDAs
-        remaining_tasks = self._estimate_remaining_tasks(simulation_result, time_t)
-        for i in range(remaining_tasks.get_size()):
-            task = remaining_tasks.get(i)
+        # Tareas que quedan en la cola en el segundo t
+        remaining_tasks = self._remaining_task_labels(state)
+        for i, task in enumerate(remaining_tasks):
             dot += f'        queue{i} [label="{task}", fillcolor="yellow"];\n'
             if i > 0:
                 dot += f'        queue{i-1} -> queue{i};\n'
@@ -96,11 +96,10 @@ class GraphvizTDAGenerator:
         dot += '        style=filled;\n'
         dot += '        fillcolor=lightgreen;\n'
         
-        # Calcular estadísticas parciales usando TDAs
-        partial_stats = self._calculate_partial_stats(simulation_result, time_t)
-        for i in range(partial_stats.get_size()):
-            stat_info = partial_stats.get(i)
-            dot += f'        {stat_info.drone_name}_stats [label="{stat_info.drone_name}\\nAgua: {stat_info.water}L\\nFertilizante: {stat_info.fertilizer}g\\nPlantas: {stat_info.plants}", shape=record];\n'
+        # Recursos acumulados por dron hasta el segundo t
+        partial_stats = self._calculate_partial_stats(simulation_result, state)
+        for stat_info in partial_stats:
+            dot += f'        {stat_info.drone_name}_stats [label="{stat_info.drone_name}\\nPosición: {stat_info.position}\\nAgua: {stat_info.water}L\\nFertilizante: {stat_info.fertilizer}g\\nPlantas: {stat_info.plants}", shape=record];\n'
         
         dot += '    }\n'
         dot += '}\n'
@@ -119,59 +118,42 @@ class GraphvizTDAGenerator:
             return 'lightblue'
         return 'white'
     
-    def _estimate_remaining_tasks(self, simulation_result, time_t):
-        """Estimar tareas restantes usando TDAs"""
+    def _remaining_task_labels(self, state):
+        """Etiquetas de las primeras tareas pendientes ('H1-P3', ...)"""
         remaining = SimpleList()
-        max_time = simulation_result.timeline.get_max_seconds()
+        if state is None:
+            remaining.add("Sin información")
+            return remaining
         
-        if time_t >= max_time:
+        if state.remaining_count == 0:
             remaining.add("Cola vacía")
             return remaining
         
-        # Tareas de ejemplo
-        sample_tasks = SimpleList()
-        sample_tasks.add("H1-P3")
-        sample_tasks.add("H2-P4") 
-        sample_tasks.add("H3-P1")
-        sample_tasks.add("H1-P1")
-        
-        # Agregar algunas tareas basado en tiempo restante
-        remaining_seconds = max_time - time_t
-        max_tasks = 3 if remaining_seconds > 6 else remaining_seconds // 2
-        
-        for i in range(min(max_tasks, sample_tasks.get_size())):
-            remaining.add(sample_tasks.get(i))
+        for task in state.remaining_tasks:
+            remaining.add(format_task(task))
         
-        if remaining.is_empty():
-            remaining.add("Finalizando...")
+        hidden = state.remaining_count - state.remaining_tasks.get_size()
+        if hidden > 0:
+            remaining.add(f"... (+{hidden})")
         
         return remaining
     
-    def _calculate_partial_stats(self, simulation_result, time_t):
-        """Calcular estadísticas parciales usando TDAs"""
+    def _calculate_partial_stats(self, simulation_result, state):
+        """Estadísticas acumuladas de cada dron en el segundo del estado"""
         partial_stats = SimpleList()
         
-        # Inicializar stats para cada dron usando TDAs
-        for i in range(simulation_result.drone_statistics.get_size()):
-            drone_stat = simulation_result.drone_statistics.get(i)
-            stat_info = DroneStatInfo(drone_stat.drone_name)
+        if state is None:
+            # Sin estado solo se conocen los nombres de los drones
+            for drone_stat in simulation_result.drone_statistics:
+                partial_stats.add(DroneStatInfo(drone_stat.drone_name))
+            return partial_stats
+        
+        for drone_state in state.drones:
+            stat_info = DroneStatInfo(drone_state.drone_name)
+            stat_info.position = f"H{drone_state.row}P{drone_state.position}"
+            stat_info.water = drone_state.water_used
+            stat_info.fertilizer = drone_state.fertilizer_used
+            stat_info.plants = drone_state.plants_irrigated
             partial_stats.add(stat_info)
         
-        # Contar acciones de riego hasta tiempo t usando TDAs
-        max_check_time = min(time_t, simulation_result.timeline.get_max_seconds())
-        
-        for second in range(1, max_check_time + 1):
-            actions = simulation_result.timeline.get_actions_at_second(second)
-            for j in range(actions.get_size()):
-                action = actions.get(j)
-                if action.action_type == 'irrigate':
-                    # Buscar estadística del dron correspondiente
-                    for k in range(partial_stats.get_size()):
-                        stat_info = partial_stats.get(k)
-                        if stat_info.drone_name == action.drone_name:
-                            stat_info.plants += 1
-                            stat_info.water += 1  # Estimación simple
-                            stat_info.fertilizer += 100  # Estimación simple
-                            break
-        
-        return partial_stats
\ No newline at end of file
+        return partial_stats
@@ -0,0 +1,128 @@
+import re
+import xml.etree.ElementTree as ET
+
+from data_structures.simple_list import SimpleList
+from data_structures.packed_tasks import PackedTasks
+from models.plant import Plant
+from models.greenhouse import Greenhouse
+from models.irrigation_plan import IrrigationPlan
+
+_DECLARATION = re.compile(rb'^(?:\xef\xbb\xbf)?\s*<\?xml[^>]*\?>')
+_LIST_OPEN = re.compile(rb'<listaInvernaderos(?=[\s/>])[^>]*>')
+_LIST_CLOSE = re.compile(rb'</listaInvernaderos\s*>')
+_GREENHOUSE_OPEN = re.compile(rb'<invernadero(?=[\s/>])[^>]*>')
+_GREENHOUSE_CLOSE = re.compile(rb'</invernadero\s*>')
+# Construcciones en las que un corte por texto no es confiable
+_UNSAFE = re.compile(rb'<!--|<!\[CDATA\[|<!DOCTYPE|<!ENTITY')
+
+def split_greenhouses(data):
+    """
+    Ubicar cada <invernadero> de la primera listaInvernaderos sin parsearlo.
+    data puede ser bytes o un mmap. Retorna (declaración XML, raíz parseada
+    sin los invernaderos, SimpleList de (inicio, fin) en bytes), o None si
+    el archivo no se puede cortar por texto con seguridad.
+    """
+    if _UNSAFE.search(data):
+        return None
+    declaration_match = _DECLARATION.match(data)
+    declaration = declaration_match.group(0).lstrip(b'\xef\xbb\xbf') if declaration_match else b""
+
+    list_open = _LIST_OPEN.search(data)
+    if list_open is None or data[list_open.end() - 2:list_open.end()] == b"/>":
+        return None
+    list_close = _LIST_CLOSE.search(data, list_open.end())
+    if list_close is None:
+        return None
+
+    # Cortar cada <invernadero>...</invernadero> del interior de la lista
+    spans = SimpleList()
+    pieces = [data[:list_open.end()]]
+    cursor = list_open.end()
+    while True:
+        opening = _GREENHOUSE_OPEN.search(data, cursor, list_close.start())
+        if opening is None:
+            break
+        if data[opening.end() - 2:opening.end()] == b"/>":
+            return None  # Invernadero vacío: que lo reporte el parser por eventos
+        closing = _GREENHOUSE_CLOSE.search(data, opening.end(), list_close.start())
+        if closing is None or _GREENHOUSE_OPEN.search(data, opening.end(), closing.start()):
+            return None
+        pieces.append(data[cursor:opening.start()])
+        spans.add((opening.start(), closing.end()))
+        cursor = closing.end()
+    pieces.append(data[cursor:])
+    skeleton = ET.fromstring(b"".join(pieces))
+
+    # Todos los invernaderos deben haber salido de la primera listaInvernaderos de la raíz
+    greenhouses_list = skeleton.find('listaInvernaderos')
+    if (greenhouses_list is None or next(skeleton.iter('listaInvernaderos')) is not greenhouses_list
+            or next(skeleton.iter('invernadero'), None) is not None):
+        return None
+    return declaration, skeleton, spans
+
+def parse_greenhouse_chunk(task):
+    """
+    Parsear el texto de un <invernadero> a tuplas (nombre, hileras, plantas
+    por hilera, plantas, asignaciones, planes). Los drones se devuelven por
+    id para resolverlos contra listaDrones. Sirve como trabajo de un proceso.
+    """
+    declaration, chunk = task
+    greenhouse_elem = ET.fromstring(declaration + chunk)
+
+    name = greenhouse_elem.get('nombre')
+    num_rows = int(greenhouse_elem.find('numeroHileras').text.strip())
+    plants_per_row = int(greenhouse_elem.find('plantasXhilera').text.strip())
+
+    plants = []
+    plants_list = greenhouse_elem.find('listaPlantas')
+    if plants_list is not None:
+        for plant_elem in plants_list.findall('planta'):
+            plants.append((
+                int(plant_elem.get('hilera')),
+                int(plant_elem.get('posicion')),
+                float(plant_elem.get('litrosAgua')),
+                float(plant_elem.get('gramosFertilizante')),
+                plant_elem.text.strip() if plant_elem.text else ""
+            ))
+
+    assignments = []
+    assignments_elem = greenhouse_elem.find('asignacionDrones')
+    if assignments_elem is not None:
+        for assignment in assignments_elem.findall('dron'):
+            assignments.append((int(assignment.get('id')), int(assignment.get('hilera'))))
+
+    # Los planes se compilan aquí: quien arma el invernadero solo copia las tareas
+    # (los que tienen tareas mal escritas van sin tareas y se compilan de nuevo con sus errores)
+    plans = []
+    plans_elem = greenhouse_elem.find('planesRiego')
+    if plans_elem is not None:
+        for plan_elem in plans_elem.findall('plan'):
+            plan_string = plan_elem.text.strip() if plan_elem.text else ""
+            plan = IrrigationPlan(plan_elem.get('nombre'), plan_string)
+            if plan.syntax_issues.is_empty():
+                plans.append((plan.name, plan.plan_string, plan.tasks.rows, plan.tasks.positions))
+            else:
+                plans.append((plan.name, plan.plan_string, None, None))
+
+    return name, num_rows, plants_per_row, plants, assignments, plans
+
+def build_greenhouse(description, config):
+    """Invernadero compilado a partir de parse_greenhouse_chunk (mismo orden que XMLParser)"""
+    name, num_rows, plants_per_row, plants, assignments, plans = description
+
+    greenhouse = Greenhouse(name, num_rows, plants_per_row)
+    for row, position, water_liters, fertilizer_grams, plant_type in plants:
+        greenhouse.add_plant(Plant(row, position, water_liters, fertilizer_grams, plant_type))
+    for drone_id, assigned_row in assignments:
+        drone = config.get_drone_by_id(drone_id)
+        if drone:
+            greenhouse.add_drone(drone, assigned_row)
+    for plan_name, plan_string, rows, positions in plans:
+        if rows is None:
+            greenhouse.add_irrigation_plan(IrrigationPlan(plan_name, plan_string))
+        else:
+            greenhouse.add_irrigation_plan(IrrigationPlan.from_tasks(
+                plan_name, plan_string, PackedTasks(rows, positions)
+            ))
+    greenhouse.compile()
+    return greenhouse
@@ -0,0 +1,105 @@
+import mmap
+import re
+import xml.etree.ElementTree as ET
+
+from models.greenhouse import GreenhouseSummary
+from models.lazy_configuration import GreenhouseEntry, LazyConfiguration
+from utils.xml_stream_parser import StreamingXMLParser
+from utils.greenhouse_chunks import split_greenhouses, parse_greenhouse_chunk, build_greenhouse
+
+_PLANTS_OPEN = re.compile(rb'<listaPlantas(?=[\s/>])[^>]*>')
+_PLANTS_CLOSE = re.compile(rb'</listaPlantas\s*>')
+_PLANT_OPEN = re.compile(rb'<planta(?=[\s/>])')
+
+class LazyXMLParser(StreamingXMLParser):
+    """
+    Indexa el XML sin parsear los invernaderos: el archivo se mapea en
+    memoria (mmap), se ubican los bytes de cada <invernadero> y de cada uno
+    se lee solo lo que muestra el listado (dimensiones, cantidad de plantas
+    y drones, planes). listaPlantas, que es lo pesado, solo se cuenta. El
+    invernadero completo se parsea cuando alguien lo pide por nombre.
+
+    Los problemas de los planes se reportan al cargar el invernadero, como
+    en el parser por eventos. Un dato inválido dentro de listaPlantas se
+    detecta recién al cargar (no al indexar): se reporta y el invernadero
+    deja de aparecer en el listado. Si el archivo no se puede cortar con
+    seguridad se usa el parser por eventos y se carga todo.
+    """
+
+    def parse_configuration_file(self, xml_file_path):
+        """Indexar archivo XML y retornar LazyConfiguration (o Configuration si no se puede)"""
+        data = None
+        try:
+            with open(xml_file_path, 'rb') as f:
+                # El mmap sigue válido después de cerrar el archivo
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            split = split_greenhouses(data)
+            if split is not None:
+                return self._index(data, *split)
+        except Exception:
+            pass  # Archivo ilegible o mal formado: lo reporta el parser por eventos
+        if data is not None:
+            data.close()
+        return super().parse_configuration_file(xml_file_path)
+
+    def _index(self, data, declaration, skeleton, spans):
+        size = len(data)
+
+        def load(entry, config):
+            if data.size() != size:
+                raise ValueError("El archivo cambió después de indexarlo")
+            description = parse_greenhouse_chunk((declaration, data[entry.start:entry.end]))
+            greenhouse = build_greenhouse(description, config)
+            self._report_plan_issues(greenhouse)
+            return greenhouse
+
+        config = LazyConfiguration(load)
+        self._parse_drones(skeleton, config)
+        for start, end in spans:
+            config.add_entry(self._index_greenhouse(data, declaration, start, end, config))
+        return config
+
+    def _index_greenhouse(self, data, declaration, start, end, config):
+        """GreenhouseEntry con el resumen leído sin convertir las plantas"""
+        plant_count = None
+        header = None
+        plants_open = _PLANTS_OPEN.search(data, start, end)
+        if plants_open is not None and data[plants_open.end() - 2:plants_open.end()] != b"/>":
+            plants_close = _PLANTS_CLOSE.search(data, plants_open.end(), end)
+            if plants_close is not None:
+                plant_count = 0
+                for _ in _PLANT_OPEN.finditer(data, plants_open.end(), plants_close.start()):
+                    plant_count += 1
+                # El resto del invernadero, sin la lista de plantas
+                header = data[start:plants_open.start()] + data[plants_close.end():end]
+        if header is None:
+            header = data[start:end]
+
+        greenhouse_elem = ET.fromstring(declaration + header)
+        name = greenhouse_elem.get('nombre')
+        num_rows = int(greenhouse_elem.find('numeroHileras').text.strip())
+        plants_per_row = int(greenhouse_elem.find('plantasXhilera').text.strip())
+
+        plants_list = greenhouse_elem.find('listaPlantas')
+        if plant_count is None:
+            plant_count = len(plants_list.findall('planta')) if plants_list is not None else 0
+        elif plants_list is not None:
+            plant_count = None  # Había otra listaPlantas: se cuenta al cargar
+
+        drone_count = 0
+        assignments = greenhouse_elem.find('asignacionDrones')
+        if assignments is not None:
+            for assignment in assignments.findall('dron'):
+                int(assignment.get('hilera'))  # Mismo error que el parser si no es número
+                if config.get_drone_by_id(int(assignment.get('id'))):
+                    drone_count += 1
+
+        summary = None
+        if plant_count is not None:
+            summary = GreenhouseSummary(name, num_rows, plants_per_row, plant_count, drone_count)
+            plans = greenhouse_elem.find('planesRiego')
+            if plans is not None:
+                for plan_elem in plans.findall('plan'):
+                    plan_string = plan_elem.text.strip() if plan_elem.text else ""
+                    summary.plans.add((plan_elem.get('nombre'), plan_string))
+        return GreenhouseEntry(name, start, end, summary)
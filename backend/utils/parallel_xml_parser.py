@@ -0,0 +1,51 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from models.configuration import Configuration
+from utils.xml_stream_parser import StreamingXMLParser
+from utils.greenhouse_chunks import split_greenhouses, parse_greenhouse_chunk, build_greenhouse
+
+class ParallelXMLParser(StreamingXMLParser):
+    """
+    Parsea los <invernadero> en un pool de procesos. El archivo se corta
+    por texto en los límites de cada invernadero; el resto del documento
+    (listaDrones) se parsea aquí y los invernaderos se arman en el orden del
+    archivo con los mismos Drone de listaDrones. Produce la misma
+    Configuration que XMLParser.
+
+    Si el archivo no se puede cortar con seguridad (comentarios, CDATA,
+    estructura inesperada) o hay pocos invernaderos, se usa el parser por
+    eventos.
+    """
+
+    MIN_GREENHOUSES = 2
+
+    def __init__(self, workers=None, chunk_size=1):
+        super().__init__()
+        self.workers = workers  # None: tantos procesos como núcleos
+        self.chunk_size = max(1, chunk_size)
+
+    def parse_configuration_file(self, xml_file_path):
+        """Parsear archivo XML con un proceso por invernadero y retornar Configuration"""
+        try:
+            with open(xml_file_path, 'rb') as f:
+                data = f.read()
+            split = split_greenhouses(data)
+        except Exception:
+            split = None  # Archivo ilegible o mal formado: lo reporta el parser por eventos
+        if split is None or split[2].get_size() < self.MIN_GREENHOUSES:
+            return super().parse_configuration_file(xml_file_path)
+
+        declaration, skeleton, spans = split
+        try:
+            config = Configuration()
+            self._parse_drones(skeleton, config)
+            tasks = [(declaration, data[start:end]) for start, end in spans]
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                for description in executor.map(parse_greenhouse_chunk, tasks, chunksize=self.chunk_size):
+                    greenhouse = build_greenhouse(description, config)
+                    self._report_plan_issues(greenhouse)
+                    config.add_greenhouse(greenhouse)
+            return config
+        except Exception:
+            # Dato inválido o corte equivocado: el parser por eventos da el error (o el resultado) correcto
+            return super().parse_configuration_file(xml_file_path)
@@ -285,9 +285,8 @@ class HTMLReportGenerator:
         
         # Ordenar drones por hilera asignada
         drones_info = []
-        for i in range(greenhouse.drones.get_size()):
-            drone = greenhouse.drones.get(i)
-            drones_info.append((drone.assigned_row, drone.name, drone.id))
+        for drone, row in zip(greenhouse.drones, greenhouse.drone_rows):
+            drones_info.append((row, drone.name, drone.id))
         
         # Ordenar por hilera
         drones_info.sort(key=lambda x: x[0])
@@ -315,8 +314,7 @@ class HTMLReportGenerator:
             <h2>Planes de Riego y Simulaciones</h2>"""
         
         # Para cada plan
-        for i in range(greenhouse.irrigation_plans.get_size()):
-            plan = greenhouse.irrigation_plans.get(i)
+        for plan in greenhouse.irrigation_plans:
             
             # Buscar resultado de simulación
             result_key = f"{greenhouse.name}_{plan.name}"
@@ -381,8 +379,7 @@ class HTMLReportGenerator:
             </thead>
             <tbody>"""
         
-        for i in range(result.drone_statistics.get_size()):
-            stat = result.drone_statistics.get(i)
+        for stat in result.drone_statistics:
             html += f"""
                 <tr>
                     <td>{stat.drone_name}</td>
@@ -410,8 +407,7 @@ class HTMLReportGenerator:
         # Obtener nombres de drones para headers
         drone_names = []
         if not result.drone_statistics.is_empty():
-            for i in range(result.drone_statistics.get_size()):
-                stat = result.drone_statistics.get(i)
+            for stat in result.drone_statistics:
                 drone_names.append(stat.drone_name)
                 html += f"<th>{stat.drone_name}</th>"
         
@@ -420,18 +416,18 @@ class HTMLReportGenerator:
             </thead>
             <tbody>"""
         
-        # Para cada segundo
-        max_seconds = result.timeline.get_max_seconds()
+        # Para cada segundo (sin guardar el timeline en resultados que solo tenían resumen)
+        timeline = result.peek_timeline()
+        max_seconds = timeline.get_max_seconds()
         
         for second in range(1, max_seconds + 1):
-            actions = result.timeline.get_actions_at_second(second)
+            actions = timeline.get_actions_at_second(second)
             
             html += f"<td><strong>{second}</strong></td>"
             
             # Crear diccionario de acciones por dron para este segundo
             actions_by_drone = {}
-            for i in range(actions.get_size()):
-                action = actions.get(i)
+            for action in actions:
                 actions_by_drone[action.drone_name] = action
             
             # Para cada dron, mostrar su acción
@@ -475,8 +471,7 @@ def generate_all_reports(configuration, simulation_results, output_dir="reports/
     
     generator = HTMLReportGenerator()
     
-    for i in range(configuration.greenhouses.get_size()):
-        greenhouse = configuration.greenhouses.get(i)
+    for greenhouse in configuration.greenhouses:
         
         # Crear nombre de archivo
         filename = f"Reporte_{greenhouse.name.replace(' ', '_')}.html"
@@ -15,8 +15,7 @@ class XMLGenerator:
         greenhouses_list = ET.SubElement(root, "listaInvernaderos")
         
         # Procesar cada invernadero
-        for i in range(configuration.greenhouses.get_size()):
-            greenhouse = configuration.greenhouses.get(i)
+        for greenhouse in configuration.greenhouses:
             greenhouse_elem = ET.SubElement(greenhouses_list, "invernadero")
             greenhouse_elem.set("nombre", greenhouse.name)
             
@@ -24,8 +23,7 @@ class XMLGenerator:
             plans_list = ET.SubElement(greenhouse_elem, "listaPlanes")
             
             # Procesar cada plan del invernadero
-            for j in range(greenhouse.irrigation_plans.get_size()):
-                irrigation_plan = greenhouse.irrigation_plans.get(j)
+            for irrigation_plan in greenhouse.irrigation_plans:
                 
                 # Buscar resultado de simulación para este plan
                 result = self._find_simulation_result(simulation_results, greenhouse.name, irrigation_plan.name)
@@ -74,8 +72,7 @@ class XMLGenerator:
         efficiency_elem = ET.SubElement(parent, "eficienciaDronesRegadores")
         
         # Para cada dron con estadísticas
-        for i in range(simulation_result.drone_statistics.get_size()):
-            drone_stat = simulation_result.drone_statistics.get(i)
+        for drone_stat in simulation_result.drone_statistics:
             
             drone_elem = ET.SubElement(efficiency_elem, "dron")
             drone_elem.set("nombre", drone_stat.drone_name)
@@ -86,19 +83,19 @@ class XMLGenerator:
         """Crear elemento de instrucciones detalladas"""
         instructions_elem = ET.SubElement(parent, "instrucciones")
         
-        # Para cada segundo en el timeline
-        max_seconds = simulation_result.timeline.get_max_seconds()
+        # Para cada segundo en el timeline (sin guardarlo en resultados que solo tenían resumen)
+        timeline = simulation_result.peek_timeline()
+        max_seconds = timeline.get_max_seconds()
         
         for second in range(1, max_seconds + 1):
-            actions = simulation_result.timeline.get_actions_at_second(second)
+            actions = timeline.get_actions_at_second(second)
             
             if not actions.is_empty():
                 time_elem = ET.SubElement(instructions_elem, "tiempo")
                 time_elem.set("segundos", str(second))
                 
                 # Para cada acción en este segundo
-                for i in range(actions.get_size()):
-                    action = actions.get(i)
+                for action in actions:
                     
                     drone_elem = ET.SubElement(time_elem, "dron")
                     drone_elem.set("nombre", action.drone_name)
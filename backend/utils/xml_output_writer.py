@@ -0,0 +1,79 @@
+import os
+from xml.sax.saxutils import escape
+
+# Además de &, < y >, dentro de un atributo entre comillas dobles hay que escapar "
+_ATTRIBUTE_ENTITIES = {'"': "&quot;"}
+
+def escape_attribute(value):
+    """Texto de un atributo XML entre comillas dobles"""
+    return escape(str(value), _ATTRIBUTE_ENTITIES)
+
+class XMLOutputWriter:
+    """
+    Escribe el XML de salida (datosSalida) a medida que se genera, a través
+    de un archivo con buffer: en memoria solo queda el buffer y el timeline
+    del plan que se está escribiendo, no el documento. Los resultados que
+    solo tenían resumen siguen sin timeline después de escribirlos. El
+    formato es el mismo que se armaba antes en un string.
+
+    Se escribe en un archivo temporal que reemplaza al destino en close();
+    si algo falla antes, abort() lo borra y el archivo anterior queda intacto.
+    """
+    BUFFER_SIZE = 1 << 16
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self._temp_path = output_path + ".tmp"
+        self._file = open(self._temp_path, 'w', encoding='utf-8', buffering=self.BUFFER_SIZE)
+        self._write = self._file.write
+        self._write('<?xml version="1.0"?>\n<datosSalida>\n  <listaInvernaderos>\n')
+
+    def start_greenhouse(self, name):
+        self._write(f'    <invernadero nombre="{escape_attribute(name)}">\n')
+        self._write('      <listaPlanes>\n')
+
+    def end_greenhouse(self):
+        self._write('      </listaPlanes>\n    </invernadero>\n')
+
+    def write_plan(self, plan_name, result):
+        """Resultado de un plan: totales, eficiencia de drones e instrucciones por segundo"""
+        write = self._write
+        write(f'        <plan nombre="{escape_attribute(plan_name)}">\n')
+        write(f'          <tiempoOptimoSegundos> {result.total_time} </tiempoOptimoSegundos>\n')
+        write(f'          <aguaRequeridaLitros> {int(result.total_water)} </aguaRequeridaLitros>\n')
+        write(f'          <fertilizanteRequeridoGramos> {int(result.total_fertilizer)} </fertilizanteRequeridoGramos>\n')
+
+        # Eficiencia de drones
+        write('          <eficienciaDronesRegadores>\n')
+        for stat in result.drone_statistics:
+            write(f'            <dron nombre="{escape_attribute(stat.drone_name)}" '
+                  f'litrosAgua="{int(stat.water_used)}" gramosFertilizante="{int(stat.fertilizer_used)}"/>\n')
+        write('          </eficienciaDronesRegadores>\n')
+
+        # Instrucciones
+        write('          <instrucciones>\n')
+        # Sin guardarlo en el resultado: solo un timeline en memoria a la vez
+        timeline = result.peek_timeline()
+        for second in range(1, timeline.get_max_seconds() + 1):
+            actions = timeline.get_actions_at_second(second)
+            if not actions.is_empty():
+                write(f'            <tiempo segundos="{second}">\n')
+                for action in actions:
+                    write(f'              <dron nombre="{escape_attribute(action.drone_name)}" '
+                          f'accion="{escape_attribute(action.description)}"/>\n')
+                write('            </tiempo>\n')
+        write('          </instrucciones>\n        </plan>\n')
+
+    def close(self):
+        """Cerrar el documento y reemplazar el archivo de salida"""
+        self._write('  </listaInvernaderos>\n</datosSalida>')
+        self._file.close()
+        os.replace(self._temp_path, self.output_path)
+
+    def abort(self):
+        """Descartar lo escrito (el archivo de salida no cambia)"""
+        self._file.close()
+        try:
+            os.remove(self._temp_path)
+        except OSError:
+            pass
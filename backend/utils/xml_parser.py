@@ -8,6 +8,9 @@ from models.irrigation_plan import IrrigationPlan  # ← Este usa la Queue corre
 from models.configuration import Configuration
 
 class XMLParser:
+    # Subir al cambiar la Configuration que se produce (invalida el caché en disco)
+    VERSION = 2
+    
     def __init__(self):
         pass
     
@@ -73,6 +76,10 @@ class XMLParser:
         # Parsear planes de riego
         self._parse_irrigation_plans(greenhouse_elem, greenhouse)
         
+        # Compilar una vez para los simuladores y validar los planes
+        greenhouse.compile()
+        self._report_plan_issues(greenhouse)
+        
         return greenhouse
     
     def _parse_plants(self, greenhouse_elem, greenhouse):
@@ -103,10 +110,15 @@ class XMLParser:
                 drone = config.get_drone_by_id(drone_id)
                 
                 if drone:
-                    # Asignar hilera
-                    drone.assign_to_row(assigned_row)
-                    # Agregar al invernadero
-                    greenhouse.add_drone(drone)
+                    # La hilera se guarda en el invernadero: el mismo dron puede
+                    # estar en otra hilera en otro invernadero
+                    greenhouse.add_drone(drone, assigned_row)
+    
+    def _report_plan_issues(self, greenhouse):
+        """Validar los planes del invernadero e imprimir sus problemas"""
+        for plan in greenhouse.validate_plans():
+            for issue in plan.issues:
+                print(f"Plan '{plan.name}' de '{greenhouse.name}': {issue.to_string()}")
     
     def _parse_irrigation_plans(self, greenhouse_elem, greenhouse):
         """Parsear planes de riego"""
@@ -132,14 +144,12 @@ def test_parser():
         
         # Mostrar drones
         print(f"Drones disponibles: {config.all_drones.get_size()}")
-        for i in range(config.all_drones.get_size()):
-            drone = config.all_drones.get(i)
+        for drone in config.all_drones:
             print(f"  - {drone.name} (ID: {drone.id})")
         
         # Mostrar invernaderos
         print(f"\nInvernaderos: {config.greenhouses.get_size()}")
-        for i in range(config.greenhouses.get_size()):
-            greenhouse = config.greenhouses.get(i)
+        for greenhouse in config.greenhouses:
             print(f"  - {greenhouse.name}")
             print(f"    Hileras: {greenhouse.num_rows}, Plantas/hilera: {greenhouse.plants_per_row}")
             print(f"    Plantas: {greenhouse.plants.get_size()}")
@@ -147,8 +157,7 @@ def test_parser():
             print(f"    Planes de riego: {greenhouse.irrigation_plans.get_size()}")
             
             # Mostrar planes
-            for j in range(greenhouse.irrigation_plans.get_size()):
-                plan = greenhouse.irrigation_plans.get(j)
+            for plan in greenhouse.irrigation_plans:
                 print(f"      Plan '{plan.name}': {plan.plan_string}")
 
 # if __name__ == "__main__":
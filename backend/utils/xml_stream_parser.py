@@ -0,0 +1,160 @@
+import xml.etree.ElementTree as ET
+
+from models.drone import Drone
+from models.plant import Plant
+from models.greenhouse import Greenhouse
+from models.irrigation_plan import IrrigationPlan
+from models.configuration import Configuration
+from data_structures.simple_list import SimpleList
+from utils.xml_parser import XMLParser
+
+class GreenhouseBuilder:
+    """Partes de un invernadero leídas hasta ahora (se arma al cerrar <invernadero>)"""
+
+    def __init__(self, name):
+        self.name = name
+        self.num_rows = None
+        self.plants_per_row = None
+        self.plants = SimpleList()
+        self.assignments = SimpleList()  # (id del dron, hilera)
+        self.plans = SimpleList()
+        self.sections = SimpleList()  # Secciones ya vistas (solo cuenta la primera, como find())
+
+    def first_section(self, tag):
+        """True la primera vez que aparece la sección 'tag' en el invernadero"""
+        if self.sections.find(tag) != -1:
+            return False
+        self.sections.add(tag)
+        return True
+
+    def build(self):
+        """Invernadero con sus plantas; drones y planes se agregan al final"""
+        if self.num_rows is None or self.plants_per_row is None:
+            raise ValueError(f"Faltan dimensiones del invernadero '{self.name}'")
+        greenhouse = Greenhouse(self.name, self.num_rows, self.plants_per_row)
+        for plant in self.plants:
+            greenhouse.add_plant(plant)
+        return greenhouse
+
+class StreamingXMLParser(XMLParser):
+    """
+    Parser por eventos (iterparse): cada dron, planta y plan se convierte en
+    objeto al cerrar su etiqueta y el elemento se quita del árbol, así que la
+    memoria crece con un invernadero y no con todo el archivo. Produce la
+    misma Configuration que XMLParser.
+    """
+
+    def parse_configuration_file(self, xml_file_path):
+        """Parsear archivo XML por partes y retornar Configuration"""
+        try:
+            return self._stream(xml_file_path)
+        except Exception as e:
+            print(f"Error parsing XML: {e}")
+            return None
+
+    def _stream(self, xml_file_path):
+        config = Configuration()
+        # Pilas de la ruta abierta: elemento, etiqueta y si se debe procesar
+        elements = []
+        tags = []
+        active = []
+        root_sections = SimpleList()  # Secciones de primer nivel ya vistas
+        builder = None
+        drones_ready = False
+        pending = SimpleList()  # (Greenhouse, GreenhouseBuilder) esperando listaDrones
+
+        for event, elem in ET.iterparse(xml_file_path, events=("start", "end")):
+            if event == "start":
+                depth = len(tags)
+                if depth == 0:
+                    is_active = True
+                elif depth == 1:
+                    # Solo la primera listaDrones / listaInvernaderos, como root.find()
+                    is_active = root_sections.find(elem.tag) == -1
+                    root_sections.add(elem.tag)
+                elif depth == 2:
+                    is_active = active[1] and (
+                        (tags[1] == 'listaDrones' and elem.tag == 'dron')
+                        or (tags[1] == 'listaInvernaderos' and elem.tag == 'invernadero')
+                    )
+                    if is_active and elem.tag == 'invernadero':
+                        builder = GreenhouseBuilder(elem.get('nombre'))
+                elif depth == 3:
+                    is_active = active[2] and builder is not None and builder.first_section(elem.tag)
+                else:
+                    is_active = active[depth - 1] and depth == 4
+                elements.append(elem)
+                tags.append(elem.tag)
+                active.append(is_active)
+                continue
+
+            elements.pop()
+            tags.pop()
+            is_active = active.pop()
+            depth = len(tags)
+
+            if is_active:
+                if depth == 2 and elem.tag == 'dron':
+                    config.add_drone(Drone(int(elem.get('id')), elem.get('nombre')))
+                elif depth == 1 and elem.tag == 'listaDrones':
+                    drones_ready = True
+                    self._finish_pending(pending, config)
+                    pending = SimpleList()
+                elif depth == 2 and elem.tag == 'invernadero':
+                    greenhouse = builder.build()
+                    config.add_greenhouse(greenhouse)
+                    if drones_ready:
+                        self._finish_greenhouse(greenhouse, builder, config)
+                    else:
+                        pending.add((greenhouse, builder))
+                    builder = None
+                elif depth >= 3:
+                    self._read_greenhouse_part(builder, tags[3] if depth == 4 else None, elem)
+
+            # Quitar del árbol lo que ya se convirtió
+            if depth >= 2:
+                elem.clear()
+                elements[-1].remove(elem)
+
+        # listaDrones ausente o después de los invernaderos
+        self._finish_pending(pending, config)
+        return config
+
+    def _read_greenhouse_part(self, builder, section, elem):
+        """Guardar en el builder una etiqueta cerrada dentro de <invernadero>"""
+        if section is None:
+            if elem.tag == 'numeroHileras':
+                builder.num_rows = int(elem.text.strip())
+            elif elem.tag == 'plantasXhilera':
+                builder.plants_per_row = int(elem.text.strip())
+
+        elif section == 'listaPlantas' and elem.tag == 'planta':
+            builder.plants.add(Plant(
+                int(elem.get('hilera')),
+                int(elem.get('posicion')),
+                float(elem.get('litrosAgua')),
+                float(elem.get('gramosFertilizante')),
+                elem.text.strip() if elem.text else ""
+            ))
+
+        elif section == 'asignacionDrones' and elem.tag == 'dron':
+            builder.assignments.add((int(elem.get('id')), int(elem.get('hilera'))))
+
+        elif section == 'planesRiego' and elem.tag == 'plan':
+            plan_string = elem.text.strip() if elem.text else ""
+            builder.plans.add(IrrigationPlan(elem.get('nombre'), plan_string))
+
+    def _finish_greenhouse(self, greenhouse, builder, config):
+        """Agregar drones asignados y planes (mismo orden que XMLParser) y compilar"""
+        for drone_id, assigned_row in builder.assignments:
+            drone = config.get_drone_by_id(drone_id)
+            if drone:
+                greenhouse.add_drone(drone, assigned_row)
+        for plan in builder.plans:
+            greenhouse.add_irrigation_plan(plan)
+        greenhouse.compile()
+        self._report_plan_issues(greenhouse)
+
+    def _finish_pending(self, pending, config):
+        for greenhouse, builder in pending:
+            self._finish_greenhouse(greenhouse, builder, config)
@@ -58,11 +58,23 @@ os.makedirs('graphs', exist_ok=True)
 os.makedirs('outputs', exist_ok=True)
 
 # === INICIALIZAR EL SERVICIO ===
+# Modo de simulación: 'sequential' (por defecto) o 'concurrent'
+SIMULATION_MODE = os.environ.get('SIMULATION_MODE', 'sequential')
+# Procesos para 'Simular todos' (1 = en el mismo proceso) y planes por tarea
+SIMULATION_WORKERS = int(os.environ.get('SIMULATION_WORKERS', '1'))
+SIMULATION_CHUNK_SIZE = int(os.environ.get('SIMULATION_CHUNK_SIZE', '1'))
+# Procesos para parsear los invernaderos del XML (1 = parser por eventos en el mismo proceso)
+PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', '1'))
+# '1' = indexar el XML y parsear cada invernadero recién cuando se consulta
+LAZY_LOADING = os.environ.get('LAZY_LOADING', '0') == '1'
+
 print("🔄 Inicializando CompleteIrrigationService...")
-irrigation_service = CompleteIrrigationService()
+irrigation_service = CompleteIrrigationService(SIMULATION_MODE, SIMULATION_WORKERS, SIMULATION_CHUNK_SIZE,
+                                               parse_workers=PARSE_WORKERS, lazy_loading=LAZY_LOADING)
 print("✅ Servicio inicializado correctamente")
 # Servicio principal
-irrigation_service = CompleteIrrigationService()
+irrigation_service = CompleteIrrigationService(SIMULATION_MODE, SIMULATION_WORKERS, SIMULATION_CHUNK_SIZE,
+                                               parse_workers=PARSE_WORKERS, lazy_loading=LAZY_LOADING)
 
 @app.route('/')
 def home():
@@ -96,11 +108,19 @@ def upload_configuration():
         if file and file.filename.lower().endswith('.xml'):
             filename = secure_filename(file.filename)
             filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
+            # Guardar aparte y reemplazar: la configuración cargada puede seguir leyendo el archivo anterior
+            temp_path = filepath + '.tmp'
+            file.save(temp_path)
+            os.replace(temp_path, filepath)
             
-            # Cargar configuración
-            if irrigation_service.load_configuration_file(filepath):
-                flash('Configuración cargada exitosamente', 'success')
+            # Cargar configuración conservando los resultados que no cambiaron
+            summary = irrigation_service.reload_configuration_file(filepath)
+            if summary:
+                if summary.kept_results or summary.resimulated_results:
+                    flash(f'Configuración cargada: {summary.kept_results} resultados conservados, '
+                          f'{summary.resimulated_results} re-simulados', 'success')
+                else:
+                    flash('Configuración cargada exitosamente', 'success')
                 return redirect(url_for('list_greenhouses'))
             else:
                 flash('Error al procesar el archivo XML', 'error')
@@ -262,8 +282,7 @@ def simulation_details(greenhouse_name, plan_name):
     for second in range(1, result.timeline.get_max_seconds() + 1):
         actions = result.timeline.get_actions_at_second(second)
         second_actions = []
-        for i in range(actions.get_size()):
-            action = actions.get(i)
+        for action in actions:
             second_actions.append({
                 'drone': action.drone_name,
                 'action': action.description,
@@ -273,8 +292,7 @@ def simulation_details(greenhouse_name, plan_name):
     
     # Estadísticas de drones
     drone_stats = []
-    for i in range(result.drone_statistics.get_size()):
-        stat = result.drone_statistics.get(i)
+    for stat in result.drone_statistics:
         drone_stats.append({
             'name': stat.drone_name,
             'water': stat.water_used,
@@ -345,8 +363,7 @@ def simulate_plan(greenhouse_name, plan_name):
             # Convertir estadísticas de drones a lista normal
             drone_stats = []
             if result.drone_statistics and not result.drone_statistics.is_empty():
-                for i in range(result.drone_statistics.get_size()):
-                    stat = result.drone_statistics.get(i)
+                for stat in result.drone_statistics:
                     drone_stats.append({
                         'name': stat.drone_name,
                         'water': stat.water_used,
@@ -363,8 +380,7 @@ def simulate_plan(greenhouse_name, plan_name):
                 second_actions = []
                 
                 if not actions.is_empty():
-                    for i in range(actions.get_size()):
-                        action = actions.get(i)
+                    for action in actions:
                         second_actions.append({
                             'drone': action.drone_name,
                             'action': action.description,
@@ -408,7 +424,23 @@ def generate_tda_graph(greenhouse_name, plan_name, time_t):
         if graph_path and os.path.exists(graph_path):
             return send_file(graph_path, as_attachment=False)
         else:
-            # Fallback: mostrar información en JSON
+            # Fallback: mostrar en JSON el estado real en el segundo t
+            state = irrigation_service.get_state_at(greenhouse_name, plan_name, time_t)
+            drones = []
+            remaining_tasks = []
+            if state:
+                for drone_state in state.drones:
+                    drones.append({
+                        'name': drone_state.drone_name,
+                        'row': drone_state.row,
+                        'position': drone_state.position,
+                        'water_used': drone_state.water_used,
+                        'fertilizer_used': drone_state.fertilizer_used,
+                        'plants_irrigated': drone_state.plants_irrigated
+                    })
+                for row, position in state.remaining_tasks:
+                    remaining_tasks.append(f"H{row}-P{position}")
+            
             return jsonify({
                 'message': f'Visualización TDA para {greenhouse_name} - {plan_name} en t={time_t}',
                 'greenhouse': greenhouse_name,
@@ -417,7 +449,10 @@ def generate_tda_graph(greenhouse_name, plan_name, time_t):
                 'total_time': result.total_time,
                 'total_water': result.total_water,
                 'total_fertilizer': result.total_fertilizer,
-                'note': 'La generación de gráficos Graphviz está en desarrollo'
+                'completed_tasks': state.completed_tasks if state else 0,
+                'remaining_count': state.remaining_count if state else 0,
+                'remaining_tasks': remaining_tasks,
+                'drones': drones
             })
             
     except Exception as e:
@@ -429,10 +464,7 @@ def simplelist_to_list(simple_list):
     if not simple_list or simple_list.is_empty():
         return []
     
-    result = []
-    for i in range(simple_list.get_size()):
-        result.append(simple_list.get(i))
-    return result
+    return list(simple_list)
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file